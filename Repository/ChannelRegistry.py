@@ -0,0 +1,142 @@
+import os
+import json
+from pathlib import Path
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+CHANNELS_CONFIG_PATH = Path(__file__).parent.parent / "channels.json"
+
+DEFAULT_POLL_MINUTES = int(os.getenv("CHANNEL_POLL_MINUTES", "360"))
+MAX_POLL_MINUTES = int(os.getenv("CHANNEL_MAX_POLL_MINUTES", "2880"))
+# A channel counts as due slightly early so cron jitter does not skip a whole cycle
+POLL_SLACK = timedelta(minutes=10)
+
+
+class ChannelRegistry:
+    """
+    Registry of YouTube channels to crawl, stored in the `channels` collection.
+
+    Each document holds the channel's own cursor (lastProcessedAt, etag,
+    uploadsPlaylistId), its priority and its polling interval. Channels listed
+    in channels.json are added on load, so a new source is a config change.
+
+    Polling adapts to activity: a poll that finds nothing doubles the
+    channel's interval (up to maxPollMinutes), a poll with new videos resets
+    it to basePollMinutes.
+
+    The cursor never moves past a video whose extraction failed: it stops
+    just before the oldest one and the etag is dropped, so the next crawl
+    returns that video (and the ones after it) again.
+    """
+
+    def __init__(self, firebase, collection: str = "channels", config_path: Path = CHANNELS_CONFIG_PATH):
+        self.firebase = firebase
+        self.collection = collection
+        self.config_path = Path(config_path)
+
+    def _configured_channels(self) -> list:
+        if not self.config_path.exists():
+            return []
+        with open(self.config_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self) -> list:
+        """Return all registered channels, adding any new ones from channels.json."""
+        channels = {c["id"]: c for c in self.firebase.get_all_documents(self.collection)}
+
+        new_docs = {}
+        legacy = None
+        for config in self._configured_channels():
+            channel_id = config["channelId"]
+            if channel_id in channels:
+                continue
+
+            base_poll = config.get("pollIntervalMinutes", DEFAULT_POLL_MINUTES)
+            doc = {
+                "channelId": channel_id,
+                "name": config.get("name", channel_id),
+                "priority": config.get("priority", 0),
+                "enabled": config.get("enabled", True),
+                "basePollMinutes": base_poll,
+                "pollIntervalMinutes": base_poll,
+                "maxPollMinutes": config.get("maxPollMinutes", MAX_POLL_MINUTES),
+                "lastPolledAt": None,
+                "lastProcessedAt": None,
+                "etag": None,
+                "uploadsPlaylistId": None
+            }
+
+            # Carry over the single-channel cursor used before the registry existed
+            if config.get("legacyCursor"):
+                legacy = legacy or self.firebase.get_document("system_state", "youtube") or {}
+                doc["lastProcessedAt"] = legacy.get("lastProcessedAt")
+                doc["etag"] = legacy.get("etag")
+                doc["uploadsPlaylistId"] = legacy.get("uploadsPlaylistId")
+
+            new_docs[channel_id] = doc
+            channels[channel_id] = {"id": channel_id, **doc}
+
+        if new_docs:
+            self.firebase.set_many(self.collection, new_docs)
+
+        return list(channels.values())
+
+    def due_channels(self, channels: list, now: datetime | None = None) -> list:
+        """Enabled channels whose polling interval has elapsed, highest priority first."""
+        now = now or datetime.now(timezone.utc)
+        due = []
+        for channel in channels:
+            if not channel.get("enabled", True):
+                continue
+            last_polled = channel.get("lastPolledAt")
+            interval = timedelta(minutes=channel.get("pollIntervalMinutes", DEFAULT_POLL_MINUTES))
+            if last_polled is None or last_polled + interval <= now + POLL_SLACK:
+                due.append(channel)
+
+        return sorted(due, key=lambda c: c.get("priority", 0), reverse=True)
+
+    def poll_update(self, channel: dict, crawl: dict, failed: set | frozenset = frozenset(),
+                    now: datetime | None = None) -> dict:
+        """
+        Build the state update for a channel after a successful crawl.
+
+        `failed` holds the IDs of crawled videos whose extraction failed;
+        the cursor is held before the oldest of them so they are retried.
+        """
+        now = now or datetime.now(timezone.utc)
+        videos = crawl["videos"]
+        failed_at = [v["publishedAt"] for v in videos if v["videoId"] in failed]
+        base = channel.get("basePollMinutes", DEFAULT_POLL_MINUTES)
+        ceiling = channel.get("maxPollMinutes", MAX_POLL_MINUTES)
+
+        if videos:
+            interval = base
+        else:
+            interval = min(channel.get("pollIntervalMinutes", base) * 2, ceiling)
+
+        cursor = channel.get("lastProcessedAt")
+        published = [v["publishedAt"] for v in videos]
+        if failed_at:
+            oldest_failed = min(failed_at)
+            published = [p for p in published if p < oldest_failed]
+        published += [cursor] if cursor else []
+
+        update = {
+            "lastPolledAt": now,
+            "pollIntervalMinutes": interval,
+            # A stored etag would answer the retry with 304 Not Modified
+            "etag": None if failed_at else crawl["etag"],
+            "uploadsPlaylistId": crawl["uploadsPlaylistId"],
+            "lastProcessedAt": max(published) if published else None
+        }
+        if videos:
+            update["lastNewVideoAt"] = now
+        return update
+
+    def save(self, updates: dict) -> dict:
+        """Persist {channel_id: update} in one bulk write."""
+        if not updates:
+            return {"succeeded": [], "failed": {}}
+        return self.firebase.set_many(self.collection, updates, merge=True)
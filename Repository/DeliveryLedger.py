@@ -0,0 +1,92 @@
+import os
+from datetime import datetime, timezone
+from firebase_admin import firestore
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+DELIVERIES_COLLECTION = "deliveries"
+# Sends per recipient and run (first attempt included) before a failure is final
+MAX_DELIVERY_ATTEMPTS = int(os.getenv("MAX_DELIVERY_ATTEMPTS", "3"))
+# SendGrid rejects a request with 400 when an address itself is invalid
+PERMANENT_FAILURE_CODES = {400}
+
+
+def delivery_status(code: int | None, recipient_error: bool = False) -> str:
+    """
+    Ledger status for a failed send with provider response `code`. Only a
+    400 that names the recipient is final; a 400 about the payload (content,
+    template) stays "failed" so the send is retried once it is fixed.
+    """
+    return "undeliverable" if code in PERMANENT_FAILURE_CODES and recipient_error else "failed"
+
+
+class DeliveryLedger:
+    """
+    Per-run record of every job alert delivery, in the `deliveries` collection.
+
+    There is one document per (run, subscriber), with the last status
+    ("sent", "failed", "undeliverable" or "skipped"), the number of
+    attempts, and the provider response code and error. Outcomes are
+    buffered and written with one bulk write per flush(). The retry pass
+    reads back the "failed" entries that still have attempts left.
+    """
+
+    def __init__(self, firebase, run_id: str, max_attempts: int = MAX_DELIVERY_ATTEMPTS):
+        self.firebase = firebase
+        self.run_id = run_id
+        self.max_attempts = max_attempts
+        self._buffer = {}
+        self._statuses = {}
+
+    def _doc_id(self, subscriber_id: str) -> str:
+        # Document IDs cannot contain "/"
+        return f"{self.run_id}__{subscriber_id.replace('/', '_')}"
+
+    def record(self, subscriber_id: str, email: str | None, status: str,
+               code: int | None = None, error: str | None = None, attempted: bool = True):
+        """Buffer the outcome of one delivery; `attempted` is False when nothing was sent."""
+        entry = {
+            "runId": self.run_id,
+            "subscriberId": subscriber_id,
+            "email": email,
+            "status": status,
+            "providerCode": code,
+            "error": error,
+            "updatedAt": datetime.now(timezone.utc)
+        }
+        if attempted:
+            entry["attempts"] = firestore.Increment(1)
+        self._buffer[self._doc_id(subscriber_id)] = entry
+        self._statuses[subscriber_id] = status
+
+    def flush(self) -> dict:
+        """Write the buffered outcomes in one bulk write."""
+        if not self._buffer:
+            return {"succeeded": [], "failed": {}}
+        buffer, self._buffer = self._buffer, {}
+        result = self.firebase.set_many(DELIVERIES_COLLECTION, buffer, merge=True)
+        for doc_id, error in result["failed"].items():
+            print(f"   ⚠️  Could not record delivery {doc_id}: {error}")
+        return result
+
+    def lookup(self, subscriber_ids: list) -> dict:
+        """Recorded entries of this run for `subscriber_ids`, keyed by subscriber ID."""
+        found = self.firebase.get_many(DELIVERIES_COLLECTION, [self._doc_id(s) for s in subscriber_ids])
+        return {doc["subscriberId"]: doc for doc in found["documents"].values()}
+
+    def retryable(self) -> list:
+        """Failed entries of this run that have attempts left."""
+        entries = self.firebase.stream_documents(
+            DELIVERIES_COLLECTION,
+            filters={"runId": self.run_id, "status": "failed"}
+        )
+        return [e for e in entries if e.get("attempts", 0) < self.max_attempts]
+
+    def summary(self) -> dict:
+        """Deliveries recorded by this process, counted by latest status."""
+        counts = {}
+        for status in self._statuses.values():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
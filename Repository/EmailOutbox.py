@@ -0,0 +1,273 @@
+import os
+import random
+import threading
+import traceback
+from collections import deque
+from datetime import datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+OUTBOX_COLLECTION = "email_outbox"
+# A repeated submission for the same address and kind within this window is dropped
+OUTBOX_DEDUP_WINDOW_SECONDS = float(os.getenv("OUTBOX_DEDUP_WINDOW_SECONDS", "600"))
+# Messages per drain pass, sent OUTBOX_SEND_CONCURRENCY at a time
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_SEND_CONCURRENCY = int(os.getenv("OUTBOX_SEND_CONCURRENCY", "4"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF_BASE_SECONDS = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "5"))
+# Idle drainer re-checks the queue this often (new messages wake it immediately)
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "30"))
+# The drainer thread starts with the first enqueue(); set to start it with the app instead
+OUTBOX_DRAIN_ON_STARTUP = os.getenv("OUTBOX_DRAIN_ON_STARTUP", "false").lower() == "true"
+# "false" = no drainer thread at all; the cron run's drain() is then the only sender
+OUTBOX_BACKGROUND_DRAIN = os.getenv("OUTBOX_BACKGROUND_DRAIN", "true").lower() == "true"
+# Most batches one drain() call sends
+OUTBOX_DRAIN_MAX_BATCHES = int(os.getenv("OUTBOX_DRAIN_MAX_BATCHES", "10"))
+# A message claimed this long ago by a worker that never reported back is sent again
+OUTBOX_CLAIM_TIMEOUT_SECONDS = 300
+# SendGrid answers 400 when the address itself is invalid
+PERMANENT_FAILURE_CODES = {400}
+
+
+def _send_verification(sendgrid, email: str, payload: dict):
+    return sendgrid.send_verification_email(email=email, verify_link=payload["verifyLink"])
+
+
+# Message kind -> how to send it
+SENDERS = {
+    "verification": _send_verification,
+}
+
+
+class EmailOutbox:
+    """
+    Transactional outbox for user-facing emails, in the `email_outbox` collection.
+
+    Request handlers call enqueue() and return; a drainer thread, started by
+    the first enqueue() of the process, sends the queued messages in
+    batches. Hosts that do not keep threads alive between requests can turn
+    the thread off (OUTBOX_BACKGROUND_DRAIN=false) and rely on drain(),
+    which every cron run calls. There is one document per (kind, address),
+    so a submission while a message is pending, or within
+    OUTBOX_DEDUP_WINDOW_SECONDS of the last send, is a no-op. Failed sends
+    are retried with jittered exponential backoff until OUTBOX_MAX_ATTEMPTS,
+    and each message is claimed ("sending") before it goes out so that
+    several workers never send the same one.
+
+    stats() reports queue depth, the age of the oldest queued message and
+    the send lag (queued -> sent) of recent messages.
+    """
+
+    def __init__(self, firebase, sendgrid, batch_size: int = OUTBOX_BATCH_SIZE,
+                 dedup_window: float = OUTBOX_DEDUP_WINDOW_SECONDS, max_attempts: int = OUTBOX_MAX_ATTEMPTS):
+        self.firebase = firebase
+        self.sendgrid = sendgrid
+        self.batch_size = batch_size
+        self.dedup_window = dedup_window
+        self.max_attempts = max_attempts
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._lags = deque(maxlen=500)
+        self._counters = {"queued": 0, "duplicates": 0, "sent": 0, "retried": 0, "failed": 0}
+        self._oldest_pending = None
+        self._next_retry_at = None
+        self._last_drain_at = None
+
+    @staticmethod
+    def _doc_id(kind: str, email: str) -> str:
+        return f"{kind}__{email.replace('/', '_')}"
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._counters[key] += amount
+
+    # ================== QUEUE ==================
+
+    def enqueue(self, kind: str, email: str, payload: dict) -> bool:
+        """Queue one message; returns False when it duplicates a pending or recent one."""
+        if kind not in SENDERS:
+            raise ValueError(f"Unknown email kind: {kind}")
+        now = datetime.now(timezone.utc)
+
+        def queue(current):
+            if current:
+                if current.get("status") in ("pending", "sending"):
+                    return None, False
+                sent_at = current.get("sentAt")
+                if current.get("status") == "sent" and sent_at and sent_at >= now - timedelta(seconds=self.dedup_window):
+                    return None, False
+            return {
+                "kind": kind,
+                "email": email,
+                "payload": payload,
+                "status": "pending",
+                "attempts": 0,
+                "createdAt": now,
+                "nextAttemptAt": now,
+                "claimedAt": None,
+                "sentAt": None,
+                "lastError": None
+            }, True
+
+        queued = self.firebase.transact(OUTBOX_COLLECTION, self._doc_id(kind, email), queue)
+        self._count("queued" if queued else "duplicates")
+        if queued and OUTBOX_BACKGROUND_DRAIN:
+            self.start()
+            self._wake.set()
+        return queued
+
+    def _claim(self, message: dict) -> dict | None:
+        """Mark a due message as being sent by this worker; None if someone else got it."""
+        now = datetime.now(timezone.utc)
+
+        def claim(current):
+            if not current:
+                return None, None
+            stale = current.get("status") == "sending" and current.get("claimedAt") and \
+                current["claimedAt"] < now - timedelta(seconds=OUTBOX_CLAIM_TIMEOUT_SECONDS)
+            if current.get("status") != "pending" and not stale:
+                return None, None
+            if current.get("status") == "pending" and current.get("nextAttemptAt") and current["nextAttemptAt"] > now:
+                return None, None
+            claimed = {**current, "status": "sending", "claimedAt": now}
+            return claimed, claimed
+
+        claimed = self.firebase.transact(OUTBOX_COLLECTION, message["id"], claim)
+        return {"id": message["id"], **claimed} if claimed else None
+
+    def _due(self) -> list:
+        now = datetime.now(timezone.utc)
+        due, oldest, next_retry = [], None, None
+        for status in ("pending", "sending"):
+            for message in self.firebase.stream_documents(OUTBOX_COLLECTION, filters={"status": status}):
+                created = message.get("createdAt")
+                if created and (oldest is None or created < oldest):
+                    oldest = created
+                if status == "pending" and message.get("nextAttemptAt") and message["nextAttemptAt"] > now:
+                    if next_retry is None or message["nextAttemptAt"] < next_retry:
+                        next_retry = message["nextAttemptAt"]
+                    continue
+                if status == "sending" and message.get("claimedAt") and \
+                        message["claimedAt"] >= now - timedelta(seconds=OUTBOX_CLAIM_TIMEOUT_SECONDS):
+                    continue
+                due.append(message)
+        self._oldest_pending = oldest
+        self._next_retry_at = next_retry
+        due.sort(key=lambda m: m.get("nextAttemptAt") or now)
+        return due[:self.batch_size]
+
+    # ================== DRAIN ==================
+
+    def _send(self, message: dict) -> tuple:
+        try:
+            SENDERS[message["kind"]](self.sendgrid, message["email"], message.get("payload") or {})
+            return message, None, None
+        except Exception as e:
+            return message, f"{type(e).__name__}: {str(e)[:300]}", getattr(e, "status_code", None)
+
+    def drain_once(self) -> int:
+        """Send one batch of due messages; returns how many were handled."""
+        claimed = [c for c in (self._claim(m) for m in self._due()) if c]
+        if not claimed:
+            self._last_drain_at = datetime.now(timezone.utc)
+            return 0
+
+        with ThreadPoolExecutor(max(1, OUTBOX_SEND_CONCURRENCY)) as pool:
+            outcomes = list(pool.map(self._send, claimed))
+
+        now = datetime.now(timezone.utc)
+        updates = {}
+        for message, error, code in outcomes:
+            attempts = message.get("attempts", 0) + 1
+            if error is None:
+                updates[message["id"]] = {"status": "sent", "attempts": attempts, "sentAt": now, "lastError": None}
+                with self._lock:
+                    self._lags.append((now - message["createdAt"]).total_seconds())
+                self._count("sent")
+            elif attempts >= self.max_attempts or code in PERMANENT_FAILURE_CODES:
+                print(f"   ❌ Outbox gave up on {message['kind']} email to {message['email']}: {error}")
+                updates[message["id"]] = {"status": "failed", "attempts": attempts, "lastError": error}
+                self._count("failed")
+            else:
+                delay = random.uniform(0.5, 1) * OUTBOX_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1)
+                retry_at = now + timedelta(seconds=delay)
+                updates[message["id"]] = {"status": "pending", "attempts": attempts, "lastError": error,
+                                          "nextAttemptAt": retry_at}
+                if self._next_retry_at is None or retry_at < self._next_retry_at:
+                    self._next_retry_at = retry_at
+                self._count("retried")
+
+        result = self.firebase.set_many(OUTBOX_COLLECTION, updates, merge=True)
+        for doc_id, error in result["failed"].items():
+            print(f"   ⚠️  Could not update outbox message {doc_id}: {error}")
+        self._last_drain_at = now
+        return len(claimed)
+
+    def drain(self, max_batches: int = OUTBOX_DRAIN_MAX_BATCHES) -> int:
+        """Send due messages until the queue is empty or `max_batches` went out; returns how many."""
+        handled = 0
+        for _ in range(max_batches):
+            sent = self.drain_once()
+            handled += sent
+            if sent < self.batch_size or self._stopped.is_set():
+                break
+        return handled
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.clear()
+            try:
+                # Keep going while full batches come back; then sleep until woken or polled
+                while self.drain_once() >= self.batch_size and not self._stopped.is_set():
+                    pass
+            except Exception:
+                print("⚠️  Outbox drain failed")
+                traceback.print_exc()
+            timeout = OUTBOX_POLL_SECONDS
+            if self._next_retry_at:
+                until_retry = (self._next_retry_at - datetime.now(timezone.utc)).total_seconds()
+                timeout = min(timeout, max(0.0, until_retry))
+            self._wake.wait(timeout)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    # ================== STATS ==================
+
+    def stats(self) -> dict:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            lags = sorted(self._lags)
+            counters = dict(self._counters)
+
+        return {
+            "depth": {
+                "pending": self.firebase.count(OUTBOX_COLLECTION, {"status": "pending"}),
+                "sending": self.firebase.count(OUTBOX_COLLECTION, {"status": "sending"}),
+                "failed": self.firebase.count(OUTBOX_COLLECTION, {"status": "failed"})
+            },
+            "oldestQueuedSeconds": round((now - self._oldest_pending).total_seconds(), 1)
+            if self._oldest_pending else None,
+            "sendLagSeconds": {
+                "samples": len(lags),
+                "p50": round(lags[len(lags) // 2], 2) if lags else None,
+                "p95": round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 2) if lags else None,
+                "max": round(lags[-1], 2) if lags else None
+            },
+            "counters": counters,
+            "drainerAlive": bool(self._thread and self._thread.is_alive()),
+            "lastDrainAt": self._last_drain_at
+        }
@@ -0,0 +1,216 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+
+EXTRACTION_CACHE_BACKEND = os.getenv("EXTRACTION_CACHE_BACKEND", "sqlite")
+EXTRACTION_CACHE_TTL_DAYS = float(os.getenv("EXTRACTION_CACHE_TTL_DAYS", "30"))
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "5000"))
+# The Firestore store deletes expired entries from set(), at most this often and this many at a time
+EXTRACTION_CACHE_PURGE_INTERVAL_SECONDS = float(os.getenv("EXTRACTION_CACHE_PURGE_INTERVAL_SECONDS", "3600"))
+EXTRACTION_CACHE_PURGE_BATCH = 500
+
+
+class SQLiteExtractionStore:
+    """Local extraction store for development, kept in a single SQLite file."""
+
+    def __init__(self, path: Path | str = CACHE_DIR / "extractions.sqlite3",
+                 max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                video_id TEXT NOT NULL,
+                result TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, expires_at FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE extractions SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, video_id: str, result: dict, ttl_seconds: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?, ?)",
+                (key, video_id, json.dumps(result), now + ttl_seconds, now)
+            )
+            # Expired rows first, then least recently used rows beyond the size limit
+            self._conn.execute("DELETE FROM extractions WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                """
+                DELETE FROM extractions WHERE key IN (
+                    SELECT key FROM extractions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+
+class FirestoreExtractionStore:
+    """
+    Production extraction store backed by a Firestore collection.
+
+    Expired entries are ignored on read, and set() deletes up to
+    EXTRACTION_CACHE_PURGE_BATCH of them every
+    EXTRACTION_CACHE_PURGE_INTERVAL_SECONDS, so the collection holds about
+    one TTL's worth of extractions. A Firestore TTL policy on `expiresAt`
+    does the same server-side without reads:
+
+        gcloud firestore fields ttls update expiresAt --collection-group=gemini_cache --enable-ttl
+    """
+
+    def __init__(self, firebase, collection: str = "gemini_cache",
+                 purge_interval: float = EXTRACTION_CACHE_PURGE_INTERVAL_SECONDS):
+        self.firebase = firebase
+        self.collection = collection
+        self.purge_interval = purge_interval
+        self._last_purge = None
+        self._purge_lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        doc = self.firebase.get_document(self.collection, key)
+        if not doc:
+            return None
+        if doc["expiresAt"] <= datetime.now(timezone.utc):
+            return None
+        return json.loads(doc["result"])
+
+    def set(self, key: str, video_id: str, result: dict, ttl_seconds: float):
+        now = datetime.now(timezone.utc)
+        self.firebase.set_document(
+            self.collection,
+            key,
+            {
+                "videoId": video_id,
+                "result": json.dumps(result),
+                "createdAt": now,
+                "expiresAt": now + timedelta(seconds=ttl_seconds)
+            }
+        )
+        self._purge_if_due(now)
+
+    def _purge_if_due(self, now: datetime):
+        # One purge at a time; concurrent writers skip it
+        if not self._purge_lock.acquire(blocking=False):
+            return
+        try:
+            if self._last_purge and (now - self._last_purge).total_seconds() < self.purge_interval:
+                return
+            self._last_purge = now
+            self.purge_expired(now)
+        finally:
+            self._purge_lock.release()
+
+    def purge_expired(self, now: datetime | None = None) -> int:
+        """Delete up to EXTRACTION_CACHE_PURGE_BATCH expired entries; returns how many were deleted."""
+        expired = [
+            doc["id"] for doc in self.firebase.query_before(
+                self.collection, "expiresAt", now or datetime.now(timezone.utc),
+                fields=["expiresAt"], limit=EXTRACTION_CACHE_PURGE_BATCH
+            )
+        ]
+        if not expired:
+            return 0
+        result = self.firebase.delete_many(self.collection, expired)
+        print(f"🧹 Extraction cache: {len(result['succeeded'])} expired entries deleted")
+        return len(result["succeeded"])
+
+
+class ExtractionCache:
+    """
+    Cache of Gemini extraction results.
+
+    Entries are keyed by video ID plus a hash of everything that influences
+    the answer (title, description, transcript, prompt version, model), so
+    an edited video or a prompt change never returns a stale result.
+    Store errors are logged and treated as misses.
+    """
+
+    def __init__(self, store, ttl_days: float = EXTRACTION_CACHE_TTL_DAYS):
+        self.store = store
+        self.ttl_seconds = ttl_days * 24 * 3600
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(video_id: str, title: str, description: str, transcript: str,
+                prompt_version: str, model: str) -> str:
+        digest = hashlib.sha256(
+            "\0".join([title, description, transcript, prompt_version, model]).encode("utf-8")
+        ).hexdigest()
+        return f"{video_id}_{digest[:32]}"
+
+    def get(self, key: str) -> dict | None:
+        try:
+            result = self.store.get(key)
+        except Exception as e:
+            print(f"⚠️  Extraction cache read failed: {type(e).__name__}: {str(e)}")
+            result = None
+
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def set(self, key: str, video_id: str, result: dict):
+        try:
+            self.store.set(key, video_id, result, self.ttl_seconds)
+        except Exception as e:
+            print(f"⚠️  Extraction cache write failed: {type(e).__name__}: {str(e)}")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def create_extraction_cache(firebase=None) -> ExtractionCache | None:
+    """
+    Build the cache selected by EXTRACTION_CACHE_BACKEND:
+    "firestore", "sqlite" (local file) or "none". Without a Firebase
+    instance (local scripts), "firestore" falls back to the sqlite store.
+    """
+    backend = EXTRACTION_CACHE_BACKEND.lower()
+
+    if backend == "none":
+        return None
+    if backend == "firestore":
+        if firebase is not None:
+            return ExtractionCache(FirestoreExtractionStore(firebase))
+        print("⚠️  EXTRACTION_CACHE_BACKEND=firestore but no Firebase instance given, using the local sqlite cache")
+        backend = "sqlite"
+    if backend == "sqlite":
+        return ExtractionCache(SQLiteExtractionStore())
+
+    raise ValueError(f"Unknown EXTRACTION_CACHE_BACKEND: {EXTRACTION_CACHE_BACKEND}")
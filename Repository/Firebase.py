@@ -1,5 +1,9 @@
 import firebase_admin
 from firebase_admin import firestore, credentials
+from google.cloud.firestore_v1 import FieldFilter
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions, BulkRetry
+from google.api_core.exceptions import AlreadyExists
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import os
 import json
@@ -7,6 +11,15 @@ from pathlib import Path
 
 load_dotenv()
 
+# Documents per get_all() call / per flushed BulkWriter chunk
+BULK_CHUNK_SIZE = 300
+# Concurrent get_all() calls, and BulkWriter write rate ceiling
+BULK_MAX_IN_FLIGHT = 4
+BULK_MAX_OPS_PER_SECOND = 500
+# Transient gRPC codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, UNAVAILABLE
+RETRYABLE_WRITE_CODES = {4, 8, 10, 14}
+MAX_WRITE_ATTEMPTS = 5
+
 class Firebase:
     def __init__(self):
         firebase_creds = os.getenv("FIREBASE_SERVICE_ACCOUNT_JSON")
@@ -35,6 +48,14 @@ class Firebase:
         self.db.collection(folder_name).document(doc_id).set(data)
         return doc_id
     
+    def create_document(self, folder_name, doc_id, data):
+        """Create a doc with a custom ID in one write; returns False if it already exists."""
+        try:
+            self.db.collection(folder_name).document(doc_id).create(data)
+            return True
+        except AlreadyExists:
+            return False
+
     def update_document(self, folder_name, doc_id, data):
         self.db.collection(folder_name).document(doc_id).update(data)
         return True
@@ -52,9 +73,152 @@ class Firebase:
             result.append({"id": doc.id, **doc.to_dict()})
         return result
     
+    def stream_documents(self, folder_name, filters=None, fields=None, page_size=500, start_after=None):
+        """
+        Yield documents matching the equality `filters` one page at a time.
+
+        Filters are applied by Firestore, `fields` limits the returned fields
+        (projection), and pages are walked with a document-ID cursor so only
+        `page_size` documents are held in memory. `start_after` resumes after
+        the given document ID.
+        """
+        query = self.db.collection(folder_name)
+        for field_name, value in (filters or {}).items():
+            query = query.where(filter=FieldFilter(field_name, "==", value))
+        if fields:
+            query = query.select(list(fields))
+        query = query.order_by("__name__").limit(page_size)
+
+        cursor = start_after
+        while True:
+            page = query.start_after({"__name__": cursor}) if cursor else query
+            # Read the page fully so no server stream stays open while the caller works
+            docs = list(page.stream())
+
+            for doc in docs:
+                yield {"id": doc.id, **(doc.to_dict() or {})}
+
+            if len(docs) < page_size:
+                return
+            cursor = docs[-1].id
+
+    def get_many(self, folder_name, doc_ids, fields=None, chunk_size=BULK_CHUNK_SIZE,
+                 max_in_flight=BULK_MAX_IN_FLIGHT):
+        """
+        Fetch many documents by ID with batched get_all() calls.
+
+        Returns {"documents": {id: data}, "missing": [ids], "failed": {id: error}}.
+        A failed chunk only marks its own IDs as failed.
+        """
+        doc_ids = list(dict.fromkeys(doc_ids))
+        collection = self.db.collection(folder_name)
+        chunks = [doc_ids[i:i + chunk_size] for i in range(0, len(doc_ids), chunk_size)]
+
+        def fetch(chunk):
+            refs = [collection.document(doc_id) for doc_id in chunk]
+            return list(self.db.get_all(refs, field_paths=fields))
+
+        result = {"documents": {}, "missing": [], "failed": {}}
+        with ThreadPoolExecutor(max(1, max_in_flight)) as pool:
+            for chunk, future in [(chunk, pool.submit(fetch, chunk)) for chunk in chunks]:
+                try:
+                    snapshots = future.result()
+                except Exception as e:
+                    for doc_id in chunk:
+                        result["failed"][doc_id] = str(e)
+                    continue
+
+                found = {snap.id: snap for snap in snapshots if snap.exists}
+                for doc_id in chunk:
+                    if doc_id in found:
+                        result["documents"][doc_id] = {"id": doc_id, **found[doc_id].to_dict()}
+                    else:
+                        result["missing"].append(doc_id)
+
+        return result
+
+    def _bulk_write(self, folder_name, documents, operation, chunk_size, max_ops_per_second):
+        """
+        Run `operation(bulk_writer, ref, data)` for every (doc_id, data) pair.
+
+        Writes go through a BulkWriter flushed every `chunk_size` documents,
+        which bounds how many writes are in flight at once. Transient errors
+        are retried up to MAX_WRITE_ATTEMPTS; everything else is reported
+        per document as {"succeeded": [ids], "failed": {id: error}}.
+        """
+        collection = self.db.collection(folder_name)
+        result = {"succeeded": [], "failed": {}}
+
+        def on_success(reference, write_result, bulk_writer):
+            result["succeeded"].append(reference.id)
+
+        def on_error(error, bulk_writer):
+            if error.code in RETRYABLE_WRITE_CODES and error.attempts < MAX_WRITE_ATTEMPTS:
+                return True
+            result["failed"][error.operation.reference.id] = f"{error.code}: {error.message}"
+            return False
+
+        writer = self.db.bulk_writer(BulkWriterOptions(
+            initial_ops_per_second=min(BULK_MAX_OPS_PER_SECOND, max_ops_per_second),
+            max_ops_per_second=max_ops_per_second,
+            retry=BulkRetry.exponential
+        ))
+        writer.on_write_result(on_success)
+        writer.on_write_error(on_error)
+
+        try:
+            pending = 0
+            for doc_id, data in documents.items():
+                try:
+                    operation(writer, collection.document(doc_id), data)
+                    pending += 1
+                except Exception as e:
+                    result["failed"][doc_id] = str(e)
+
+                if pending >= chunk_size:
+                    writer.flush()
+                    pending = 0
+        finally:
+            writer.close()
+
+        return result
+
+    def set_many(self, folder_name, documents, merge=False, chunk_size=BULK_CHUNK_SIZE,
+                 max_ops_per_second=BULK_MAX_OPS_PER_SECOND):
+        """Set many documents given as {doc_id: data}; see `_bulk_write` for the result."""
+        return self._bulk_write(
+            folder_name,
+            documents,
+            lambda writer, ref, data: writer.set(ref, data, merge=merge),
+            chunk_size,
+            max_ops_per_second
+        )
+
+    def update_many(self, folder_name, updates, chunk_size=BULK_CHUNK_SIZE,
+                    max_ops_per_second=BULK_MAX_OPS_PER_SECOND):
+        """Update many existing documents given as {doc_id: fields}; see `_bulk_write`."""
+        return self._bulk_write(
+            folder_name,
+            updates,
+            lambda writer, ref, data: writer.update(ref, data),
+            chunk_size,
+            max_ops_per_second
+        )
+
     def delete_document(self, folder_name, doc_id):
         self.db.collection(folder_name).document(doc_id).delete()
         return True
+
+    def delete_many(self, folder_name, doc_ids, chunk_size=BULK_CHUNK_SIZE,
+                    max_ops_per_second=BULK_MAX_OPS_PER_SECOND):
+        """Delete many documents by ID; see `_bulk_write` for the result."""
+        return self._bulk_write(
+            folder_name,
+            dict.fromkeys(doc_ids),
+            lambda writer, ref, data: writer.delete(ref),
+            chunk_size,
+            max_ops_per_second
+        )
     
     def query_by_field(self, folder_name, field_name, value):
         docs = self.db.collection(folder_name).where(field_name, "==", value).stream()
@@ -63,6 +227,53 @@ class Firebase:
             result.append({"id": doc.id, **doc.to_dict()})
         return result
     
+    def query_since(self, folder_name, field_name, since, fields=None):
+        """Yield documents whose `field_name` is at or after `since`, oldest first."""
+        query = self.db.collection(folder_name).where(filter=FieldFilter(field_name, ">=", since))
+        if fields:
+            query = query.select(list(fields))
+        for doc in query.order_by(field_name).stream():
+            yield {"id": doc.id, **(doc.to_dict() or {})}
+    
+    def query_before(self, folder_name, field_name, before, fields=None, limit=None):
+        """Yield documents whose `field_name` is before `before`, oldest first (at most `limit`)."""
+        query = self.db.collection(folder_name).where(filter=FieldFilter(field_name, "<", before))
+        if fields is not None:
+            query = query.select(list(fields))
+        query = query.order_by(field_name)
+        if limit:
+            query = query.limit(limit)
+        for doc in query.stream():
+            yield {"id": doc.id, **(doc.to_dict() or {})}
+
+    def count(self, folder_name, filters=None):
+        """Number of documents matching the equality `filters` (server-side count aggregation)."""
+        query = self.db.collection(folder_name)
+        for field_name, value in (filters or {}).items():
+            query = query.where(filter=FieldFilter(field_name, "==", value))
+        return query.count().get()[0][0].value
+
+    def transact(self, folder_name, doc_id, update_fn):
+        """
+        Read-modify-write one document in a transaction.
+
+        `update_fn(current)` gets the document data (None when it does not
+        exist) and returns (new_data, result): new_data replaces the
+        document, None leaves it untouched. Firestore re-runs the function
+        if the document changed concurrently. Returns `result`.
+        """
+        ref = self.db.collection(folder_name).document(doc_id)
+
+        @firestore.transactional
+        def run(transaction):
+            snapshot = ref.get(transaction=transaction)
+            new_data, result = update_fn(snapshot.to_dict() if snapshot.exists else None)
+            if new_data is not None:
+                transaction.set(ref, new_data)
+            return result
+
+        return run(self.db.transaction())
+
     def exists(self, folder_name, field_name, value):
         docs = self.db.collection(folder_name).where(field_name, "==", value).stream()
         for doc in docs:
@@ -76,10 +287,20 @@ Docstring for Repository.Firebase
 | ------------------- | ---------------------------------------- | ------------------------------------- |
 | `addDocument()`     | Add doc with auto-generated ID           | Add new course, vehicle, etc.         |
 | `setDocument()`     | Add or overwrite doc with custom ID      | Create faculty with UID as ID         |
+| `createDocument()`  | Add doc with custom ID unless it exists  | Register a subscriber exactly once    |
 | `updateDocument()`  | Update fields in an existing doc         | Update asset condition                |
 | `getDocument()`     | Fetch single doc by ID (returns id+data) | Get details of a specific route       |
 | `getAllDocuments()` | Fetch all docs in a collection           | List all hostel rooms                 |
 | `deleteDocument()`  | Delete doc by ID                         | Remove a book record                  |
+| `deleteMany()`      | Bulk delete docs with per-doc errors     | Purge expired cache entries           |
 | `queryByField()`    | Fetch docs where a field matches a value | Get all buses assigned to route "R12" |
+| `streamDocuments()` | Filtered, projected, paged doc generator | Stream active subscribers             |
+| `querySince()`      | Docs with a field at or after a value    | Jobs seen in the last 30 days         |
+| `queryBefore()`     | Docs with a field before a value         | Cache entries past their expiry       |
+| `getMany()`         | Fetch many docs by ID in batched reads   | Load delivery state for a batch       |
+| `setMany()`         | Bulk set docs with per-doc error report  | Admin backfills                       |
+| `updateMany()`      | Bulk update docs with per-doc errors     | Mark a batch of deliveries as sent    |
+| `count()`           | Server-side count of matching docs       | Outbox queue depth                    |
+| `transact()`        | Transactional read-modify-write of a doc | Queue an email unless one is pending  |
 
 """
\ No newline at end of file
@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import random
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+from google.api_core import exceptions as api_exceptions
+import google.generativeai as genai
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+# Per-call deadline, and how often a transient failure is retried before the call gives up
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+GEMINI_MAX_ATTEMPTS = int(os.getenv("GEMINI_MAX_ATTEMPTS", "3"))
+GEMINI_BACKOFF_BASE_SECONDS = float(os.getenv("GEMINI_BACKOFF_BASE_SECONDS", "2"))
+GEMINI_BACKOFF_MAX_SECONDS = float(os.getenv("GEMINI_BACKOFF_MAX_SECONDS", "30"))
+# Consecutive failed calls after which the model is not called again for the rest of the run
+GEMINI_BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5"))
+
+# Errors worth retrying: quota, overload, deadlines and server-side faults
+TRANSIENT_ERRORS = (
+    api_exceptions.TooManyRequests,
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.InternalServerError,
+    api_exceptions.BadGateway,
+    api_exceptions.Aborted,
+    TimeoutError,
+    ConnectionError,
+)
+
+# ================== RESPONSE SCHEMAS ==================
+
+OPENING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "company": {"type": "string", "nullable": True},
+        "role": {"type": "string", "nullable": True},
+        "employmentType": {"type": "string", "enum": ["Internship", "Full-time", "Contract"], "nullable": True},
+        "workMode": {"type": "string", "enum": ["On-site", "Remote", "Hybrid"], "nullable": True},
+        "duration": {"type": "string", "nullable": True},
+        "location": {"type": "string", "nullable": True},
+        "requiredSkills": {"type": "array", "items": {"type": "string"}},
+        "applyLink": {"type": "string", "nullable": True},
+        "summary": {"type": "string"}
+    },
+    "required": ["company", "role", "employmentType", "workMode", "location", "requiredSkills", "applyLink", "summary"]
+}
+
+VIDEO_RESULT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "isJobVideo": {"type": "boolean"},
+        "openings": {"type": "array", "items": OPENING_SCHEMA}
+    },
+    "required": ["isJobVideo", "openings"]
+}
+
+# Response schemas cannot declare free-form keys, so a batch answers with a list tagged by videoId
+BATCH_RESULT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "videos": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "videoId": {"type": "string"},
+                    **VIDEO_RESULT_RESPONSE_SCHEMA["properties"]
+                },
+                "required": ["videoId", "isJobVideo", "openings"]
+            }
+        }
+    },
+    "required": ["videos"]
+}
+
+
+class GeminiUnavailable(Exception):
+    """A Gemini call failed for good: retries exhausted, a permanent error, or the breaker is open."""
+
+
+class GeminiClient:
+    """
+    Gemini wrapper for structured JSON extraction.
+
+    Every call asks for application/json constrained by a response schema,
+    carries its own deadline, and retries transient errors with jittered
+    exponential backoff. A malformed answer is retried like a transient
+    error. After `breaker_threshold` consecutive failed calls the circuit
+    breaker opens and every further call fails immediately until reset(),
+    which the cron job calls at the start of each run.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        timeout: float = GEMINI_TIMEOUT_SECONDS,
+        max_attempts: int = GEMINI_MAX_ATTEMPTS,
+        breaker_threshold: int = GEMINI_BREAKER_THRESHOLD,
+        backoff_base: float = GEMINI_BACKOFF_BASE_SECONDS,
+        backoff_max: float = GEMINI_BACKOFF_MAX_SECONDS
+    ):
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.breaker_threshold = breaker_threshold
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._open = False
+        self._counters = {"calls": 0, "attempts": 0, "retries": 0, "failures": 0, "rejected": 0}
+
+    @property
+    def breaker_open(self) -> bool:
+        return self._open
+
+    def reset(self):
+        """Close the breaker and clear counters before a new run."""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._open = False
+            self._counters = {key: 0 for key in self._counters}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "breakerOpen": self._open}
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._counters[key] += amount
+
+    def _record_success(self):
+        with self._lock:
+            self._consecutive_failures = 0
+
+    def _record_failure(self):
+        with self._lock:
+            self._counters["failures"] += 1
+            self._consecutive_failures += 1
+            if not self._open and self._consecutive_failures >= self.breaker_threshold:
+                self._open = True
+                print(f"🔌 Gemini circuit breaker opened after {self._consecutive_failures} consecutive failures")
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: a random delay up to the capped exponential step
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def generate_json(self, prompt: str, schema: dict) -> dict:
+        """
+        Run `prompt` and return the parsed JSON answer.
+
+        Raises GeminiUnavailable when no valid answer could be obtained.
+        """
+        if self._open:
+            self._count("rejected")
+            raise GeminiUnavailable("circuit breaker is open")
+
+        self._count("calls")
+        last_error = None
+        for attempt in range(1, self.max_attempts + 1):
+            self._count("attempts")
+            try:
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config=genai.GenerationConfig(
+                        response_mime_type="application/json",
+                        response_schema=schema
+                    ),
+                    # retry=None turns off the library's own retry so ours stays bounded
+                    request_options={"timeout": self.timeout, "retry": None}
+                )
+                result = json.loads(response.text)
+                if isinstance(result, dict):
+                    self._record_success()
+                    return result
+                last_error = f"expected a JSON object, got {type(result).__name__}"
+            except TRANSIENT_ERRORS as e:
+                last_error = f"{type(e).__name__}: {str(e)[:200]}"
+            except json.JSONDecodeError as e:
+                # Structured output can still be cut off (e.g. max output tokens)
+                last_error = f"malformed JSON: {str(e)}"
+            except api_exceptions.GoogleAPIError as e:
+                # Invalid request, permission denied, ...: retrying will not help
+                last_error = f"{type(e).__name__}: {str(e)[:200]}"
+                break
+            except ValueError as e:
+                # response.text raises ValueError when the answer was blocked or has no parts
+                last_error = f"{type(e).__name__}: {str(e)[:200]}"
+                break
+
+            if attempt < self.max_attempts:
+                delay = self._backoff(attempt)
+                print(f"   ⏳ Gemini attempt {attempt} failed ({last_error}), retrying in {delay:.1f}s")
+                self._count("retries")
+                time.sleep(delay)
+
+        self._record_failure()
+        raise GeminiUnavailable(last_error)
@@ -0,0 +1,239 @@
+import os
+import re
+import json
+import time
+import base64
+import hashlib
+import threading
+from bisect import bisect_right
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+from pathlib import Path
+
+from Repository.JobIndex import JOBS_COLLECTION, normalize_employment_type
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+# Openings last seen within this many days are listed
+JOB_CATALOG_DAYS = int(os.getenv("JOB_CATALOG_DAYS", "90"))
+# At most one Firestore sync per interval, however many requests arrive
+JOB_CATALOG_REFRESH_SECONDS = float(os.getenv("JOB_CATALOG_REFRESH_SECONDS", "60"))
+JOB_CATALOG_CACHE_CONTROL = os.getenv("JOB_CATALOG_CACHE_CONTROL", "public, max-age=60, stale-while-revalidate=300")
+JOB_CATALOG_MAX_LIMIT = 100
+JOB_CATALOG_SYNC_OVERLAP = timedelta(minutes=10)
+
+PUBLIC_FIELDS = ["company", "role", "employmentType", "workMode", "duration", "location",
+                 "requiredSkills", "applyLink", "summary", "firstSeenAt"]
+
+LOCATION_ALIASES = {
+    "bengaluru": "bangalore",
+    "gurugram": "gurgaon",
+    "bombay": "mumbai",
+    "new delhi": "delhi",
+    "wfh": "remote",
+    "work from home": "remote",
+    "pan india": "anywhere",
+}
+
+WORK_MODES = {"on-site": "on-site", "onsite": "on-site", "on site": "on-site", "office": "on-site",
+              "remote": "remote", "wfh": "remote", "hybrid": "hybrid"}
+
+# ================== FACETS ==================
+
+def _clean(value) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def location_terms(location: str | None) -> set:
+    """Searchable terms of a free-text location ("Bengaluru / Hyderabad, India")."""
+    terms = set()
+    for part in re.split(r"[,/|;]|\bor\b|\band\b", _clean(location)):
+        part = part.strip(" .()")
+        if part:
+            terms.add(LOCATION_ALIASES.get(part, part))
+    return terms
+
+
+def job_facets(job: dict) -> dict:
+    """{facet: set of values} a job is indexed under."""
+    work_mode = WORK_MODES.get(_clean(job.get("workMode")))
+    locations = location_terms(job.get("location"))
+    if work_mode == "remote":
+        locations.add("remote")
+    return {
+        "employmentType": {t for t in [normalize_employment_type(job.get("employmentType"))] if t},
+        "workMode": {work_mode} if work_mode else set(),
+        "location": locations,
+        "skill": {_clean(s) for s in job.get("requiredSkills") or [] if _clean(s)}
+    }
+
+
+def normalize_filter(facet: str, value: str) -> str:
+    value = _clean(value)
+    if facet == "employmentType":
+        return normalize_employment_type(value)
+    if facet == "workMode":
+        return WORK_MODES.get(value, value)
+    if facet == "location":
+        return LOCATION_ALIASES.get(value, value)
+    return value
+
+
+class InvalidCursor(ValueError):
+    pass
+
+# ================== CATALOG ==================
+
+class JobCatalog:
+    """
+    Read-only view of the `jobs` collection for the /api/jobs endpoint.
+
+    All listed openings live in memory together with an inverted index
+    (facet -> value -> fingerprints) for employmentType, workMode, location
+    and skill. refresh() only asks Firestore for documents whose lastSeenAt
+    moved since the previous sync and updates the index for those, so new
+    openings appear without a rebuild. Each page carries an ETag derived
+    from its own contents (fingerprints and lastSeenAt of the jobs on it,
+    plus the total and the next cursor), so every worker, before or after
+    a restart, gives the same data the same ETag.
+    """
+
+    def __init__(self, firebase, days: int = JOB_CATALOG_DAYS,
+                 refresh_seconds: float = JOB_CATALOG_REFRESH_SECONDS):
+        self.firebase = firebase
+        self.days = days
+        self.refresh_seconds = refresh_seconds
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._jobs = {}
+        self._facets = {}
+        self._index = {"employmentType": {}, "workMode": {}, "location": {}, "skill": {}}
+        self._order = []
+        self._last_seen = {}
+        self._watermark = None
+        self._refreshed_at = 0.0
+
+    @staticmethod
+    def _sort_key(job: dict) -> tuple:
+        # Newest first; the fingerprint breaks ties so the order is total
+        return (-job["firstSeenAt"].timestamp(), job["fingerprint"])
+
+    def _remove(self, fingerprint: str):
+        self._jobs.pop(fingerprint, None)
+        for facet, values in self._facets.pop(fingerprint, {}).items():
+            for value in values:
+                members = self._index[facet].get(value)
+                if members is not None:
+                    members.discard(fingerprint)
+                    if not members:
+                        del self._index[facet][value]
+
+    def _add(self, fingerprint: str, doc: dict):
+        job = {"fingerprint": fingerprint, **{field: doc.get(field) for field in PUBLIC_FIELDS}}
+        self._jobs[fingerprint] = job
+        facets = job_facets(job)
+        self._facets[fingerprint] = facets
+        for facet, values in facets.items():
+            for value in values:
+                self._index[facet].setdefault(value, set()).add(fingerprint)
+
+    def refresh(self, now: datetime | None = None) -> int:
+        """Apply the jobs added or re-seen since the last sync. Returns how many changed."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=self.days)
+        # The overlap catches writes that committed after a later timestamp was already read
+        since = max(self._watermark - JOB_CATALOG_SYNC_OVERLAP, cutoff) if self._watermark else cutoff
+
+        docs = self.firebase.query_since(JOBS_COLLECTION, "lastSeenAt", since)
+
+        with self._lock:
+            changed = 0
+            for doc in docs:
+                if not doc.get("firstSeenAt") or self._last_seen.get(doc["id"]) == doc["lastSeenAt"]:
+                    continue
+                self._remove(doc["id"])
+                self._add(doc["id"], doc)
+                self._last_seen[doc["id"]] = doc["lastSeenAt"]
+                changed += 1
+                if self._watermark is None or doc["lastSeenAt"] > self._watermark:
+                    self._watermark = doc["lastSeenAt"]
+
+            # Openings not seen again within the window drop out of the catalog
+            expired = [fp for fp, last_seen in self._last_seen.items() if last_seen < cutoff]
+            for fingerprint in expired:
+                self._remove(fingerprint)
+                del self._last_seen[fingerprint]
+
+            if changed or expired:
+                self._order = sorted((self._sort_key(job) for job in self._jobs.values()))
+            self._refreshed_at = time.monotonic()
+            return changed + len(expired)
+
+    def refresh_if_stale(self):
+        if time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return
+        # One request refreshes, concurrent ones keep serving the current index
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() - self._refreshed_at >= self.refresh_seconds:
+                self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def _etag(self, page: list, total: int, next_cursor: str | None) -> str:
+        digest = hashlib.sha256(f"{total}:{next_cursor}".encode("utf-8"))
+        for _, fingerprint in page:
+            digest.update(f"\n{fingerprint}:{self._last_seen[fingerprint].isoformat()}".encode("utf-8"))
+        return '"' + digest.hexdigest()[:32] + '"'
+
+    @staticmethod
+    def _encode_cursor(key: tuple) -> str:
+        return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            ts, fingerprint = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return (float(ts), str(fingerprint))
+        except (ValueError, TypeError):
+            raise InvalidCursor("Invalid cursor")
+
+    def search(self, filters: dict | None = None, cursor: str | None = None, limit: int = 20) -> dict:
+        """
+        One page of openings, newest first.
+
+        `filters` maps a facet to a list of accepted values: values of one
+        facet are OR-ed, facets are AND-ed. `cursor` is the "nextCursor" of
+        the previous page. Returns {"jobs", "nextCursor", "total", "etag"}.
+        """
+        limit = max(1, min(limit, JOB_CATALOG_MAX_LIMIT))
+        after = self._decode_cursor(cursor) if cursor else None
+
+        with self._lock:
+            matched = None
+            for facet, values in (filters or {}).items():
+                members = set()
+                for value in values:
+                    members |= self._index[facet].get(normalize_filter(facet, value), set())
+                matched = members if matched is None else matched & members
+
+            if matched is None:
+                keys = self._order
+            else:
+                keys = sorted(self._sort_key(self._jobs[fp]) for fp in matched)
+
+            start = bisect_right(keys, after) if after else 0
+            page = keys[start:start + limit]
+            jobs = [self._jobs[fingerprint] for _, fingerprint in page]
+            has_more = start + limit < len(keys)
+            next_cursor = self._encode_cursor(page[-1]) if page and has_more else None
+
+            return {
+                "jobs": jobs,
+                "nextCursor": next_cursor,
+                "total": len(keys),
+                "etag": self._etag(page, len(keys), next_cursor)
+            }
@@ -0,0 +1,246 @@
+import os
+import re
+import html
+import hashlib
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from datetime import datetime, timezone, timedelta
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+JOBS_COLLECTION = "jobs"
+# How far back an opening counts as already announced
+JOB_DEDUP_WINDOW_DAYS = int(os.getenv("JOB_DEDUP_WINDOW_DAYS", "30"))
+
+# ================== NORMALIZATION ==================
+
+COMPANY_SUFFIXES = {
+    "inc", "incorporated", "ltd", "limited", "pvt", "private", "llc", "llp",
+    "corp", "corporation", "co", "company", "plc", "gmbh", "india", "and"
+}
+
+COMPANY_ALIASES = {
+    "tata consultancy services": "tcs",
+    "jp morgan chase": "jpmorgan",
+    "jp morgan": "jpmorgan",
+    "jpmorgan chase": "jpmorgan",
+    "hcl technologies": "hcl",
+    "hcltech": "hcl",
+    "infosys technologies": "infosys",
+    "meta platforms": "meta",
+    "facebook": "meta",
+    "alphabet": "google",
+}
+
+ROLE_SYNONYMS = [
+    (re.compile(r"\bsde\b"), "software development engineer"),
+    (re.compile(r"\bswe\b"), "software engineer"),
+    (re.compile(r"\binternship\b|\binterns\b"), "intern"),
+    (re.compile(r"\bdev\b"), "developer"),
+    (re.compile(r"\bml\b"), "machine learning"),
+]
+# Words that change between announcements of the same opening
+ROLE_NOISE = re.compile(r"\b(20[2-3]\d|batch|freshers?|hiring|role|position|opening|openings|job|for|the|off ?campus)\b")
+
+EMPLOYMENT_TYPES = {"internship": "internship", "full-time": "full-time", "full time": "full-time",
+                    "fulltime": "full-time", "contract": "contract"}
+
+# Query parameters that identify a posting; everything else (utm_*, ref, source) is dropped
+LINK_ID_PARAMS = {"id", "jobid", "job_id", "gh_jid", "jid", "jk", "req", "reqid", "requisitionid", "postingid", "jobreqid"}
+# Paths this short point at a careers home page, not at one opening
+GENERIC_LINK_PATHS = {"", "/careers", "/jobs", "/career", "/join-us", "/apply"}
+
+
+def _words(text: str | None) -> str:
+    # "J.P. Morgan" -> "jp morgan", "A&B" -> "a and b"
+    text = html.unescape(text or "").lower().replace(".", "").replace("&", " and ")
+    return " ".join(re.sub(r"[^a-z0-9+#]+", " ", text).split())
+
+
+def normalize_company(company: str | None) -> str:
+    name = _words(company)
+    words = name.split()
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    name = " ".join(words)
+    return COMPANY_ALIASES.get(name, name)
+
+
+def normalize_role(role: str | None) -> str:
+    text = _words(role)
+    for pattern, replacement in ROLE_SYNONYMS:
+        text = pattern.sub(replacement, text)
+    return " ".join(ROLE_NOISE.sub(" ", text).split())
+
+
+def normalize_employment_type(employment_type: str | None) -> str:
+    return EMPLOYMENT_TYPES.get((employment_type or "").strip().lower(), "")
+
+
+def _split_link(link: str | None) -> tuple:
+    """(host, path, identifying query parameters) of an apply link."""
+    if not link or not link.strip():
+        return "", "", []
+    link = link.strip()
+    try:
+        parts = urlsplit(link if "://" in link else f"https://{link}")
+        host = (parts.hostname or "").lower()
+    except ValueError:
+        return "", "", []
+    if host.startswith("www."):
+        host = host[4:]
+    path = re.sub(r"/+", "/", parts.path).rstrip("/").lower()
+    params = sorted((k.lower(), v) for k, v in parse_qsl(parts.query) if k.lower() in LINK_ID_PARAMS)
+    return host, path, params
+
+
+def normalize_link(link: str | None) -> str:
+    """host/path (plus identifying query parameters) of an apply link, or "" for none."""
+    host, path, params = _split_link(link)
+    if not host:
+        return ""
+    return f"{host}{path}" + (f"?{urlencode(params)}" if params else "")
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def fingerprint_opening(opening: dict) -> dict:
+    """
+    Normalized identity of an opening.
+
+    "fingerprint" hashes canonical company, role and employment type.
+    "linkKey" hashes company and apply-link host/path, and is only set
+    when the link points at a specific posting rather than a careers page.
+    """
+    company = normalize_company(opening.get("company"))
+    role = normalize_role(opening.get("role"))
+    employment_type = normalize_employment_type(opening.get("employmentType"))
+    host, path, params = _split_link(opening.get("applyLink"))
+    link = normalize_link(opening.get("applyLink"))
+    specific_link = bool(host) and (path not in GENERIC_LINK_PATHS or bool(params))
+
+    if company or role:
+        fingerprint = _digest(company, role, employment_type)
+    else:
+        # Nothing to identify the opening by except its link or summary
+        fingerprint = _digest("", "", employment_type, link or _words(opening.get("summary")))
+
+    return {
+        "fingerprint": fingerprint,
+        "linkKey": _digest(company, link) if specific_link else None,
+        "company": company,
+        "role": role,
+        "employmentType": employment_type,
+        "link": link
+    }
+
+
+def _filled_fields(opening: dict) -> int:
+    return sum(1 for value in opening.values() if value not in (None, "", []))
+
+# ================== INDEX ==================
+
+class JobIndex:
+    """
+    Index of announced openings in the `jobs` collection, keyed by fingerprint.
+
+    load_recent() reads the openings seen in the last JOB_DEDUP_WINDOW_DAYS
+    into memory once per run. dedupe() drops openings that repeat within the
+    run or match that history, by fingerprint or by apply link. record()
+    adds the new openings (with first-seen metadata) and bumps lastSeenAt
+    and seenCount on the repeats in one bulk write.
+    """
+
+    def __init__(self, firebase, window_days: int = JOB_DEDUP_WINDOW_DAYS):
+        self.firebase = firebase
+        self.window_days = window_days
+        self._by_fingerprint = {}
+        self._by_link = {}
+        self._new = {}
+        self._seen_again = {}
+
+    def load_recent(self, now: datetime | None = None) -> int:
+        now = now or datetime.now(timezone.utc)
+        since = now - timedelta(days=self.window_days)
+        for doc in self.firebase.query_since(JOBS_COLLECTION, "lastSeenAt", since,
+                                             fields=["fingerprint", "linkKey"]):
+            self._by_fingerprint[doc["id"]] = doc["id"]
+            if doc.get("linkKey"):
+                self._by_link[doc["linkKey"]] = doc["id"]
+        return len(self._by_fingerprint)
+
+    def _known(self, identity: dict) -> str | None:
+        known = self._by_fingerprint.get(identity["fingerprint"])
+        if known is None and identity["linkKey"]:
+            known = self._by_link.get(identity["linkKey"])
+        return known
+
+    def dedupe(self, items: list) -> dict:
+        """
+        `items` are {"opening", "videoId", "channelId"} dicts in extraction order.
+
+        Returns {"openings": unique new openings, "duplicates": {"run", "history"}}.
+        Among repeats within the run, the most complete copy is kept.
+        """
+        history = set(self._by_fingerprint)
+        fresh = {}
+        duplicates = {"run": 0, "history": 0}
+
+        for item in items:
+            identity = fingerprint_opening(item["opening"])
+            known = self._known(identity)
+
+            if known is not None and known in history:
+                duplicates["history"] += 1
+                self._seen_again[known] = self._seen_again.get(known, 0) + 1
+                continue
+
+            if known is not None:
+                duplicates["run"] += 1
+                if _filled_fields(item["opening"]) > _filled_fields(fresh[known]["opening"]):
+                    fresh[known] = {**fresh[known], "opening": item["opening"]}
+                continue
+
+            fingerprint = identity["fingerprint"]
+            fresh[fingerprint] = {**item, "identity": identity}
+            self._by_fingerprint[fingerprint] = fingerprint
+            if identity["linkKey"]:
+                self._by_link[identity["linkKey"]] = fingerprint
+
+        self._new.update(fresh)
+        return {"openings": [entry["opening"] for entry in fresh.values()], "duplicates": duplicates}
+
+    def record(self, now: datetime | None = None) -> dict:
+        """Write new openings and refresh repeated ones."""
+        now = now or datetime.now(timezone.utc)
+        documents = {}
+
+        for fingerprint, entry in self._new.items():
+            documents[fingerprint] = {
+                **entry["opening"],
+                "fingerprint": fingerprint,
+                "linkKey": entry["identity"]["linkKey"],
+                "normalizedCompany": entry["identity"]["company"],
+                "normalizedRole": entry["identity"]["role"],
+                "firstSeenAt": now,
+                "lastSeenAt": now,
+                "firstVideoId": entry.get("videoId"),
+                "firstChannelId": entry.get("channelId"),
+                "seenCount": 1
+            }
+        # Imported here so the normalization helpers stay cheap to import for the web app
+        from firebase_admin import firestore
+        for fingerprint, count in self._seen_again.items():
+            documents[fingerprint] = {"lastSeenAt": now, "seenCount": firestore.Increment(count)}
+
+        self._new, self._seen_again = {}, {}
+        if not documents:
+            return {"succeeded": [], "failed": {}}
+
+        result = self.firebase.set_many(JOBS_COLLECTION, documents, merge=True)
+        for fingerprint, error in result["failed"].items():
+            print(f"   ⚠️  Could not index job {fingerprint}: {error}")
+        return result
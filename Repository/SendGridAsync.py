@@ -0,0 +1,263 @@
+import os
+import time
+import random
+import asyncio
+import threading
+import httpx
+from python_http_client.exceptions import HTTPError
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+SENDGRID_API_URL = "https://api.sendgrid.com"
+# Concurrent requests in flight; each worker holds at most one pooled connection
+SENDGRID_ASYNC_WORKERS = int(os.getenv("SENDGRID_ASYNC_WORKERS", "8"))
+# Steady request rate and burst the token bucket allows before SendGrid pushes back
+SENDGRID_RATE_PER_SECOND = float(os.getenv("SENDGRID_RATE_PER_SECOND", "10"))
+SENDGRID_BURST = int(os.getenv("SENDGRID_BURST", "20"))
+SENDGRID_TIMEOUT_SECONDS = float(os.getenv("SENDGRID_TIMEOUT_SECONDS", "30"))
+# Attempts per request for 429 and 5xx answers and network errors
+SENDGRID_MAX_ATTEMPTS = int(os.getenv("SENDGRID_MAX_ATTEMPTS", "4"))
+
+# The rate never drops below this fraction of the configured one
+MIN_RATE_FRACTION = 0.05
+# Default pause when a 429 comes without a usable Retry-After
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+# ================== RATE LIMITING ==================
+
+class TokenBucket:
+    """
+    Async token bucket with an adaptive rate (additive increase, multiplicative decrease).
+
+    acquire() waits for a token. throttle() is called on a 429: it halves the
+    refill rate and blocks every worker until Retry-After has passed. Each
+    success afterwards gives back 5% of the configured rate.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttle(self, retry_after: float | None):
+        now = time.monotonic()
+        self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+        self.paused_until = max(self.paused_until, now + (retry_after or DEFAULT_RETRY_AFTER_SECONDS))
+        self._refill(now)
+        self.tokens = 0.0
+
+    def recover(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After") or response.headers.get("X-RateLimit-Reset")
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    # X-RateLimit-Reset is an epoch timestamp
+    return max(0.0, seconds - time.time()) if seconds > 1e9 else seconds
+
+# ================== THROUGHPUT ==================
+
+# Upper bounds of the requests-per-second histogram buckets
+HISTOGRAM_BOUNDS = [1, 2, 5, 10, 20, 50, 100]
+
+
+class ThroughputHistogram:
+    """
+    Requests completed per wall-clock second, summarized as a histogram of
+    how many seconds reached each throughput band.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._per_second = {}
+            self.sent = 0
+            self.failed = 0
+            self.throttled = 0
+            self.retried = 0
+
+    def record(self, outcome: str):
+        with self._lock:
+            second = int(time.time())
+            if outcome in ("sent", "failed"):
+                self._per_second[second] = self._per_second.get(second, 0) + 1
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            if not self._per_second:
+                return {"sent": self.sent, "failed": self.failed, "throttled": self.throttled,
+                        "retried": self.retried, "seconds": 0, "histogram": {}}
+
+            first, last = min(self._per_second), max(self._per_second)
+            # Seconds without a completed request count as 0 req/s
+            rates = sorted(self._per_second.get(s, 0) for s in range(first, last + 1))
+            histogram = {}
+            for rate in rates:
+                upper = next((b for b in HISTOGRAM_BOUNDS if rate <= b), None)
+                label = f"<={upper}/s" if upper is not None else f">{HISTOGRAM_BOUNDS[-1]}/s"
+                if rate == 0:
+                    label = "0/s"
+                histogram[label] = histogram.get(label, 0) + 1
+
+            return {
+                "sent": self.sent,
+                "failed": self.failed,
+                "throttled": self.throttled,
+                "retried": self.retried,
+                "seconds": len(rates),
+                "meanPerSecond": round((self.sent + self.failed) / len(rates), 2),
+                "p50PerSecond": rates[len(rates) // 2],
+                "p90PerSecond": rates[min(len(rates) - 1, int(len(rates) * 0.9))],
+                "maxPerSecond": rates[-1],
+                "histogram": histogram
+            }
+
+# ================== SENDER ==================
+
+class AsyncSendGridSender:
+    """
+    Sends /v3/mail/send requests from a pool of async workers.
+
+    The sender runs its own event loop on a daemon thread, so synchronous
+    callers (FastAPI routes, the cron thread) hand over a request with
+    send() or several at once with send_many() and wait for the outcome.
+    All workers share one keep-alive httpx.AsyncClient and are gated by a
+    TokenBucket. 429s slow the bucket down and are retried after
+    Retry-After; 5xx answers and network errors are retried with jittered
+    backoff. Other errors raise python_http_client's HTTPError, like the
+    official client, so existing error handling keeps working.
+    """
+
+    def __init__(self, api_key: str, workers: int = SENDGRID_ASYNC_WORKERS,
+                 rate: float = SENDGRID_RATE_PER_SECOND, burst: int = SENDGRID_BURST,
+                 timeout: float = SENDGRID_TIMEOUT_SECONDS, max_attempts: int = SENDGRID_MAX_ATTEMPTS):
+        self.api_key = api_key
+        self.workers = max(1, workers)
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.histogram = ThroughputHistogram()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="sendgrid-async", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    async def _start(self):
+        self._client = httpx.AsyncClient(
+            base_url=SENDGRID_API_URL,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers)
+        )
+        self._bucket = TokenBucket(self.rate, self.burst)
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self):
+        while True:
+            payload, future = await self._queue.get()
+            try:
+                status_code = await self._post(payload)
+                if not future.done():
+                    future.set_result(status_code)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def _post(self, payload: dict) -> int:
+        for attempt in range(1, self.max_attempts + 1):
+            await self._bucket.acquire()
+            try:
+                response = await self._client.post("/v3/mail/send", json=payload)
+            except httpx.TransportError:
+                if attempt == self.max_attempts:
+                    self.histogram.record("failed")
+                    raise
+                self.histogram.record("retried")
+                await asyncio.sleep(random.uniform(0, min(30, 2 ** attempt)))
+                continue
+
+            if response.status_code < 300:
+                self._bucket.recover()
+                self.histogram.record("sent")
+                return response.status_code
+
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if retryable and attempt < self.max_attempts:
+                if response.status_code == 429:
+                    self.histogram.record("throttled")
+                    self._bucket.throttle(_retry_after(response))
+                else:
+                    self.histogram.record("retried")
+                    await asyncio.sleep(random.uniform(0, min(30, 2 ** attempt)))
+                continue
+
+            self.histogram.record("failed")
+            raise HTTPError(response.status_code, response.reason_phrase, response.content, dict(response.headers))
+
+    async def _submit(self, payload: dict) -> int:
+        future = self._loop.create_future()
+        await self._queue.put((payload, future))
+        return await future
+
+    def send(self, payload: dict) -> int:
+        """Send one mail/send payload; returns the status code or raises."""
+        return asyncio.run_coroutine_threadsafe(self._submit(payload), self._loop).result()
+
+    def send_many(self, payloads: list) -> list:
+        """Send payloads concurrently; returns a status code or the exception for each, in order."""
+        async def gather():
+            return await asyncio.gather(*(self._submit(p) for p in payloads), return_exceptions=True)
+        return asyncio.run_coroutine_threadsafe(gather(), self._loop).result()
+
+    def stats(self, reset: bool = False) -> dict:
+        """Throughput since the last reset, plus the bucket's current rate."""
+        snapshot = self.histogram.snapshot()
+        snapshot["ratePerSecond"] = round(self._bucket.rate, 2)
+        snapshot["workers"] = self.workers
+        if reset:
+            self.histogram.reset()
+        return snapshot
+
+    def close(self):
+        async def shutdown():
+            for task in self._tasks:
+                task.cancel()
+            await self._client.aclose()
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
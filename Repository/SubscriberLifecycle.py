@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+
+SUBSCRIBERS_COLLECTION = "subscribers"
+
+# States, derived from the isVerified/subscribed flags the rest of the app filters on
+UNVERIFIED = "unverified"
+ACTIVE = "active"
+UNSUBSCRIBED = "unsubscribed"
+
+STATE_FLAGS = {
+    UNVERIFIED: {"isVerified": False, "subscribed": False},
+    ACTIVE: {"isVerified": True, "subscribed": True},
+    UNSUBSCRIBED: {"isVerified": True, "subscribed": False},
+}
+
+# target state -> states it may be reached from
+TRANSITIONS = {
+    ACTIVE: {UNVERIFIED, UNSUBSCRIBED},
+    UNSUBSCRIBED: {ACTIVE},
+}
+
+
+def subscriber_state(doc: dict | None) -> str | None:
+    """State of a subscriber document, or None when there is none."""
+    if doc is None:
+        return None
+    if not doc.get("isVerified"):
+        return UNVERIFIED
+    return ACTIVE if doc.get("subscribed") else UNSUBSCRIBED
+
+
+class SubscriberNotFound(LookupError):
+    pass
+
+
+class InvalidTransition(ValueError):
+    def __init__(self, email: str, current: str, target: str):
+        super().__init__(f"Cannot move {email} from {current} to {target}")
+        self.current = current
+        self.target = target
+
+
+class SubscriberLifecycle:
+    """
+    Subscriber state machine: unverified -> active -> unsubscribed -> active.
+
+    register() creates the document (keyed by email) only if it does not
+    exist, in a single write. Every other change goes through transition(),
+    one transaction on that document that checks the current state before
+    writing, so two concurrent requests cannot both act on a stale read.
+    Transitions return the state the subscriber was in before.
+    """
+
+    def __init__(self, firebase):
+        self.firebase = firebase
+
+    def register(self, email: str, data: dict) -> bool:
+        """Create an unverified subscriber; returns False when the email is already registered."""
+        return self.firebase.create_document(SUBSCRIBERS_COLLECTION, email, {
+            **data,
+            "email": email,
+            **STATE_FLAGS[UNVERIFIED],
+            "createdAt": datetime.now(timezone.utc)
+        })
+
+    def transition(self, email: str, target: str) -> dict:
+        """
+        Move a subscriber to `target`.
+
+        Returns {"previous", "state", "changed"}; being in `target` already is
+        not an error and writes nothing. Raises SubscriberNotFound, or
+        InvalidTransition when `target` cannot be reached from the current state.
+        """
+        allowed = TRANSITIONS[target]
+
+        def apply(current):
+            state = subscriber_state(current)
+            if state is None:
+                raise SubscriberNotFound(email)
+            if state == target:
+                return None, {"previous": state, "state": state, "changed": False}
+            if state not in allowed:
+                raise InvalidTransition(email, state, target)
+            return (
+                {**current, **STATE_FLAGS[target], "stateChangedAt": datetime.now(timezone.utc)},
+                {"previous": state, "state": target, "changed": True}
+            )
+
+        return self.firebase.transact(SUBSCRIBERS_COLLECTION, email, apply)
+
+    def request_resubscribe(self, email: str, preferences: dict | None = None) -> dict:
+        """
+        Precondition for re-subscribing: the subscriber exists and is not
+        active. Checked and, when `preferences` are given, stored in one
+        transaction; the state itself only changes once the email is verified.
+
+        Returns {"previous", "state", "changed"}. Raises SubscriberNotFound,
+        or InvalidTransition when the subscriber is already active.
+        """
+        def apply(current):
+            state = subscriber_state(current)
+            if state is None:
+                raise SubscriberNotFound(email)
+            if state not in TRANSITIONS[ACTIVE]:
+                raise InvalidTransition(email, state, ACTIVE)
+            result = {"previous": state, "state": state, "changed": False}
+            if preferences is None:
+                return None, result
+            return {**current, "preferences": preferences}, result
+
+        return self.firebase.transact(SUBSCRIBERS_COLLECTION, email, apply)
+
+    def activate(self, email: str) -> dict:
+        """Email verified: unverified or unsubscribed -> active."""
+        return self.transition(email, ACTIVE)
+
+    def unsubscribe(self, email: str) -> dict:
+        """active -> unsubscribed."""
+        return self.transition(email, UNSUBSCRIBED)
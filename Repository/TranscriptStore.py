@@ -0,0 +1,80 @@
+import os
+import gzip
+import json
+import time
+import tempfile
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+
+# How long each kind of entry is trusted before the transcript is fetched again.
+# "ok" transcripts do not change; auto-generated captions can appear a few hours
+# after upload, so "not_found" is re-checked much sooner than "disabled".
+TRANSCRIPT_TTL_SECONDS = {
+    "ok": float(os.getenv("TRANSCRIPT_TTL_DAYS", "90")) * 24 * 3600,
+    "disabled": 7 * 24 * 3600,
+    "unavailable": 7 * 24 * 3600,
+    "not_found": 6 * 3600,
+    "transient": 15 * 60,
+}
+
+
+class TranscriptStore:
+    """
+    Compressed on-disk transcript cache.
+
+    Each video has one gzip-compressed JSON file holding either the transcript
+    segments ("ok") or a negative entry with the reason it is missing
+    ("disabled", "not_found", "unavailable", "transient"). Every entry carries
+    its own expiry, taken from TRANSCRIPT_TTL_SECONDS.
+    """
+
+    def __init__(self, directory: Path | str = CACHE_DIR / "transcripts"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, video_id: str) -> Path:
+        return self.directory / f"{video_id}.json.gz"
+
+    def get(self, video_id: str) -> dict | None:
+        """Return the entry for `video_id`, or None when absent or expired."""
+        path = self._path(video_id)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Truncated or corrupt file: treat as a miss, it will be rewritten
+            return None
+
+        if entry.get("expiresAt", 0) <= time.time():
+            return None
+        return entry
+
+    def put(self, video_id: str, status: str, segments: list | None = None,
+            reason: str | None = None) -> dict:
+        now = time.time()
+        entry = {
+            "videoId": video_id,
+            "status": status,
+            "reason": reason,
+            "segments": segments or [],
+            "fetchedAt": now,
+            "expiresAt": now + TRANSCRIPT_TTL_SECONDS[status]
+        }
+
+        # Write to a temp file and rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(json.dumps(entry).encode("utf-8"))
+            os.replace(tmp_path, self._path(video_id))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        return entry
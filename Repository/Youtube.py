@@ -1,19 +1,70 @@
 import os
-import json
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from googleapiclient.discovery import build
-from youtube_transcript_api import YouTubeTranscriptApi
+from googleapiclient.errors import HttpError
+from youtube_transcript_api import (
+    YouTubeTranscriptApi,
+    TranscriptsDisabled,
+    NoTranscriptFound,
+    VideoUnavailable
+)
 import google.generativeai as genai
 
+from Repository.GeminiClient import (
+    GeminiClient,
+    GeminiUnavailable,
+    VIDEO_RESULT_RESPONSE_SCHEMA,
+    BATCH_RESULT_RESPONSE_SCHEMA
+)
+from Repository.ExtractionCache import ExtractionCache, create_extraction_cache
+from Repository.TranscriptStore import TranscriptStore
+from Repository.YoutubeAsync import YoutubeAsync
+from utils.transcript_windows import select_transcript, estimate_tokens
+
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 
+# Bump whenever the extraction prompt changes so cached results are not reused
+PROMPT_VERSION = "3"
+
+EXTRACTION_RULES = """2. If multiple openings are mentioned, extract EACH opening separately.
+3. Ignore promotions, sponsorships, personal mentoring, WhatsApp channels, referrals, discounts, and unrelated links.
+4. Prefer official application links.
+5. Normalize and correct company names if misspelled.
+6. If workMode is "Remote", set location to "WFH".
+7. If the video has no genuine openings, set isJobVideo to false and return an empty openings list."""
+
+# Batched extraction: most videos and estimated prompt tokens packed into one Gemini call
+GEMINI_BATCH_MAX_VIDEOS = int(os.getenv("GEMINI_BATCH_MAX_VIDEOS", "4"))
+GEMINI_BATCH_TOKEN_BUDGET = int(os.getenv("GEMINI_BATCH_TOKEN_BUDGET", "12000"))
+
+# Parallel downloads of prefetch_transcripts()
+TRANSCRIPT_PREFETCH_CONCURRENCY = int(os.getenv("TRANSCRIPT_PREFETCH_CONCURRENCY", "8"))
+
+# videos().list accepts at most 50 comma-separated IDs per call
+VIDEOS_LIST_MAX_IDS = 50
+
+# playlistItems().list page size (API maximum) and the most videos a single
+# crawl will return, so a first run or a long outage cannot flood one alert
+PLAYLIST_PAGE_SIZE = 50
+CRAWL_MAX_VIDEOS = int(os.getenv("CRAWL_MAX_VIDEOS", "200"))
+
+# "discovery" uses googleapiclient, "async" sends Data API calls through YoutubeAsync
+YOUTUBE_BACKEND = os.getenv("YOUTUBE_BACKEND", "discovery")
+
 
 class Youtube:
     """YouTube service for fetching videos and extracting job openings."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        extraction_cache: ExtractionCache | None = None,
+        firebase=None,
+        transcript_store: TranscriptStore | None = None
+    ):
         self.api_key = os.getenv("GCP_API_KEY")
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
         self.gemini_model = "gemini-2.5-flash"
@@ -23,9 +74,33 @@ class Youtube:
         if not self.gemini_api_key:
             raise ValueError("GEMINI_API_KEY not found")
 
-        self.youtube = build("youtube", "v3", developerKey=self.api_key)
+        # googleapiclient's HTTP transport is not thread-safe, so every worker
+        # thread of the extraction pipeline gets its own service object, built
+        # on first use.
+        self._local = threading.local()
+        # Pooled async client; calls from all pipeline threads share its connections
+        self.api = YoutubeAsync(self.api_key) if YOUTUBE_BACKEND == "async" else None
         genai.configure(api_key=self.gemini_api_key)
-        self.gemini = genai.GenerativeModel(self.gemini_model)
+        # Structured output, per-call deadline, bounded retries and a per-run circuit breaker
+        self.gemini = GeminiClient(self.gemini_model)
+        self.extraction_cache = extraction_cache or create_extraction_cache(firebase)
+        self.transcript_store = transcript_store or TranscriptStore()
+
+        # Snippets seen during the current run: video_id -> {"title", "description",
+        # "publishedAt", "complete"}. search().list truncates descriptions, so those
+        # entries are marked incomplete and re-resolved through videos().list.
+        self._metadata = {}
+        self._metadata_lock = threading.Lock()
+        self._uploads_playlists = {}
+
+    @property
+    def youtube(self):
+        client = getattr(self._local, "youtube", None)
+        if client is None:
+            # The discovery document bundled with googleapiclient; no network round trip
+            client = build("youtube", "v3", developerKey=self.api_key, static_discovery=True, cache_discovery=False)
+            self._local.youtube = client
+        return client
 
     def get_recent_videos(
         self,
@@ -45,12 +120,19 @@ class Youtube:
         if published_after:
             params["publishedAfter"] = published_after
 
+        if self.api:
+            videos = self.api.run(self.api.get_recent_videos(channel_id, max_results, published_after))
+            for video in videos:
+                self._remember_snippet(video["videoId"], video, complete=False)
+            return videos
+
         request = self.youtube.search().list(**params)
         response = request.execute()
 
         videos = []
         for item in response.get("items", []):
             snippet = item["snippet"]
+            self._remember_snippet(item["id"]["videoId"], snippet, complete=False)
             videos.append({
                 "videoId": item["id"]["videoId"],
                 "title": snippet["title"],
@@ -60,38 +142,271 @@ class Youtube:
 
         return videos
 
-    def get_transcript(self, video_id: str) -> str:
-        try:
-            transcript = YouTubeTranscriptApi.get_transcript(video_id)
-            return " ".join(item["text"] for item in transcript)
-        except Exception:
-            return ""
+    def get_uploads_playlist_id(self, channel_id: str) -> str:
+        """Look up (once per process) the playlist holding all uploads of a channel."""
+        if channel_id not in self._uploads_playlists and self.api:
+            self._uploads_playlists[channel_id] = self.api.run(self.api.get_uploads_playlist_id(channel_id))
+        if channel_id not in self._uploads_playlists:
+            response = self.youtube.channels().list(
+                part="contentDetails",
+                id=channel_id
+            ).execute()
 
-    def get_title_description(self, video_id: str) -> dict:
-        request = self.youtube.videos().list(
-            part="snippet",
-            id=video_id
-        )
-        response = request.execute()
+            if not response.get("items"):
+                raise ValueError(f"Channel not found: {channel_id}")
+
+            self._uploads_playlists[channel_id] = (
+                response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+            )
+        return self._uploads_playlists[channel_id]
+
+    def crawl_uploads(
+        self,
+        channel_id: str,
+        published_after: str | None = None,
+        etag: str | None = None,
+        uploads_playlist_id: str | None = None,
+        max_videos: int = CRAWL_MAX_VIDEOS
+    ) -> dict:
+        """
+        Collect every upload newer than `published_after` from the channel's
+        uploads playlist (1 quota unit per page instead of 100 for search).
+
+        Pages are followed until a video at or before the cursor shows up or
+        `max_videos` is reached. The first page is requested with
+        If-None-Match: `etag`, so an unchanged playlist costs one 304.
+
+        Returns {"videos", "etag", "uploadsPlaylistId", "notModified", "pages"},
+        with videos newest first in the same shape as get_recent_videos.
+        """
+        if uploads_playlist_id:
+            self._uploads_playlists[channel_id] = uploads_playlist_id
+        playlist_id = self.get_uploads_playlist_id(channel_id)
+
+        if self.api:
+            crawl = self.api.run(self.api.crawl_uploads(
+                channel_id, published_after, etag=etag, uploads_playlist_id=playlist_id, max_videos=max_videos
+            ))
+            for video in crawl["videos"]:
+                self._remember_snippet(video["videoId"], video, complete=True)
+            return crawl
 
-        if not response.get("items"):
-            return {"title": "", "description": ""}
+        videos = []
+        first_etag = etag
+        page_token = None
+        pages = 0
+
+        while True:
+            request = self.youtube.playlistItems().list(
+                part="snippet,contentDetails",
+                playlistId=playlist_id,
+                maxResults=PLAYLIST_PAGE_SIZE,
+                pageToken=page_token
+            )
+            if pages == 0 and etag:
+                request.headers["If-None-Match"] = etag
+
+            try:
+                response = request.execute()
+            except HttpError as e:
+                if pages == 0 and e.resp.status == 304:
+                    return {
+                        "videos": [],
+                        "etag": etag,
+                        "uploadsPlaylistId": playlist_id,
+                        "notModified": True,
+                        "pages": 1
+                    }
+                raise
+
+            pages += 1
+            if pages == 1:
+                first_etag = response.get("etag")
+
+            reached_cursor = False
+            for item in response.get("items", []):
+                published_at = item.get("contentDetails", {}).get("videoPublishedAt")
+                if not published_at:
+                    # Private or deleted upload
+                    continue
+                if published_after and published_at <= published_after:
+                    reached_cursor = True
+                    continue
+
+                snippet = item["snippet"]
+                video_id = item["contentDetails"]["videoId"]
+                # playlistItems snippets carry the full description
+                self._remember_snippet(video_id, {**snippet, "publishedAt": published_at}, complete=True)
+                videos.append({
+                    "videoId": video_id,
+                    "title": snippet["title"],
+                    "description": snippet["description"],
+                    "publishedAt": published_at
+                })
+
+            page_token = response.get("nextPageToken")
+            if reached_cursor or not page_token or len(videos) >= max_videos:
+                break
 
-        snippet = response["items"][0]["snippet"]
+        videos.sort(key=lambda v: v["publishedAt"], reverse=True)
         return {
-            "title": snippet.get("title", ""),
-            "description": snippet.get("description", "")
+            "videos": videos[:max_videos],
+            "etag": first_etag,
+            "uploadsPlaylistId": playlist_id,
+            "notModified": False,
+            "pages": pages
         }
 
-    def extract_jobs_with_gemini(self, title: str, description: str, transcript: str) -> dict:
+    def _download_transcript(self, video_id: str) -> dict:
+        """Fetch a transcript from YouTube and store it, or the reason it is missing."""
+        try:
+            if hasattr(YouTubeTranscriptApi, "get_transcript"):
+                segments = YouTubeTranscriptApi.get_transcript(video_id)
+            else:
+                segments = YouTubeTranscriptApi().fetch(video_id).to_raw_data()
+        except TranscriptsDisabled:
+            return self.transcript_store.put(video_id, "disabled", reason="Captions are disabled")
+        except NoTranscriptFound:
+            return self.transcript_store.put(video_id, "not_found", reason="No transcript in the requested language")
+        except VideoUnavailable:
+            return self.transcript_store.put(video_id, "unavailable", reason="Video is unavailable")
+        except Exception as e:
+            return self.transcript_store.put(video_id, "transient", reason=f"{type(e).__name__}: {str(e)[:200]}")
+
+        segments = [
+            {"text": s["text"], "start": s["start"], "duration": s["duration"]}
+            for s in segments
+        ]
+        return self.transcript_store.put(video_id, "ok", segments=segments)
+
+    def get_transcript_entry(self, video_id: str) -> dict:
+        """
+        Return the stored transcript entry for a video, downloading it on a miss.
+
+        The entry has "status" ("ok" or the reason it is missing), "reason"
+        and "segments" (dicts with "text", "start" and "duration").
+        """
+        entry = self.transcript_store.get(video_id)
+        if entry is None:
+            entry = self._download_transcript(video_id)
+        return entry
+
+    def prefetch_transcripts(self, video_ids: list, concurrency: int = TRANSCRIPT_PREFETCH_CONCURRENCY) -> dict:
+        """
+        get_transcript_entry() for many videos at once: stored transcripts are
+        read from the store, the rest are downloaded concurrently and stored,
+        so later runs and debugging sessions never download them again.
+
+        Returns {video_id: entry}.
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        with ThreadPoolExecutor(max(1, concurrency), thread_name_prefix="transcripts") as pool:
+            return dict(zip(video_ids, pool.map(self.get_transcript_entry, video_ids)))
+
+    def get_transcript_segments(self, video_id: str) -> list:
+        return self.get_transcript_entry(video_id)["segments"]
+
+    def get_transcript(self, video_id: str) -> str:
+        return " ".join(s["text"] for s in self.get_transcript_segments(video_id))
+
+    def _remember_snippet(self, video_id: str, snippet: dict, complete: bool):
+        with self._metadata_lock:
+            known = self._metadata.get(video_id)
+            if known and known["complete"] and not complete:
+                return
+            self._metadata[video_id] = {
+                "title": snippet.get("title", ""),
+                "description": snippet.get("description", ""),
+                "publishedAt": snippet.get("publishedAt"),
+                "complete": complete
+            }
+
+    def clear_metadata_cache(self):
+        """Forget snippets from a previous run."""
+        with self._metadata_lock:
+            self._metadata.clear()
+
+    def get_videos_metadata(self, video_ids: list) -> dict:
+        """
+        Resolve title and full description for many videos.
+
+        Videos already resolved in this run are served from memory; the rest
+        are fetched with one videos().list call per 50 IDs.
+        Returns {video_id: {"title", "description"}}.
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        with self._metadata_lock:
+            pending = [
+                v for v in video_ids
+                if v not in self._metadata or not self._metadata[v]["complete"]
+            ]
+
+        if self.api and pending:
+            # All videos().list calls in flight at once
+            for video_id, snippet in self.api.run(self.api.get_snippets(pending)).items():
+                self._remember_snippet(video_id, snippet or {}, complete=True)
+            pending = []
+
+        for start in range(0, len(pending), VIDEOS_LIST_MAX_IDS):
+            chunk = pending[start:start + VIDEOS_LIST_MAX_IDS]
+            request = self.youtube.videos().list(
+                part="snippet",
+                id=",".join(chunk),
+                maxResults=len(chunk)
+            )
+            response = request.execute()
+
+            found = set()
+            for item in response.get("items", []):
+                self._remember_snippet(item["id"], item["snippet"], complete=True)
+                found.add(item["id"])
+
+            # Deleted or private videos: remember them as empty so they are not re-queried
+            for video_id in set(chunk) - found:
+                self._remember_snippet(video_id, {}, complete=True)
+
+        result = {}
+        with self._metadata_lock:
+            for video_id in video_ids:
+                meta = self._metadata.get(video_id)
+                if meta and meta["complete"]:
+                    result[video_id] = {"title": meta["title"], "description": meta["description"]}
+                else:
+                    result[video_id] = {"title": "", "description": ""}
+        return result
+
+    def get_title_description(self, video_id: str) -> dict:
+        return self.get_videos_metadata([video_id])[video_id]
+
+    def extract_jobs_with_gemini(
+        self,
+        title: str,
+        description: str,
+        transcript: str,
+        video_id: str | None = None
+    ) -> dict:
+        """
+        Extract job openings with Gemini.
+
+        Returns {"status", "isJobVideo", "openings"} where status is "ok"
+        (openings found), "empty" (a valid answer without openings) or
+        "failed" (no valid answer; "error" says why). Only ok and empty
+        results are cached, so a failure is retried on the next run.
+
+        When `video_id` is given, the extraction cache is consulted first.
+        """
+        cache_key = None
+        if video_id and self.extraction_cache:
+            cache_key = self.extraction_cache.key_for(
+                video_id, title, description, transcript, PROMPT_VERSION, self.gemini_model
+            )
+            cached = self.extraction_cache.get(cache_key)
+            if cached is not None:
+                print(f"♻️  Using cached extraction for {video_id}")
+                return self._with_status(cached)
+
         print(f"Extracting video {title}")
         prompt = f"""
-IMPORTANT:
-- Respond with STRICT VALID JSON only.
-- No markdown.
-- No explanations.
-- No trailing commas.
-
 You are an AI assistant that extracts job and internship openings from YouTube videos.
 
 Video Title:
@@ -100,67 +415,204 @@ Video Title:
 Video Description:
 {description}
 
-Video Transcript:
+Video Transcript (long transcripts are trimmed to their most relevant excerpts, each prefixed with [mm:ss]):
 {transcript}
 
 Your Tasks:
 1. Determine whether this video contains one or more genuine job or internship openings.
-2. If multiple openings are mentioned, extract EACH opening separately.
-3. Ignore promotions, sponsorships, personal mentoring, WhatsApp channels, referrals, discounts, and unrelated links.
-4. Prefer official application links.
-5. Normalize and correct company names if misspelled.
-6. If workMode is "Remote", set location to "WFH".
-
-Return STRICT JSON ONLY:
-
-{{
-  "isJobVideo": boolean,
-  "openings": [
-    {{
-      "company": string | null,
-      "role": string | null,
-      "employmentType": "Internship" | "Full-time" | "Contract" | null,
-      "workMode": "On-site" | "Remote" | "Hybrid" | null,
-      "duration": string | null,
-      "location": string | null,
-      "requiredSkills": [string],
-      "applyLink": string | null,
-      "summary": string
-    }}
-  ]
-}}
+{EXTRACTION_RULES}
 """
         try:
-            response = self.gemini.generate_content(prompt)
-            result = json.loads(response.text)
-            print(f"✅ Successfully extracted: isJobVideo={result.get('isJobVideo')}, openings={len(result.get('openings', []))}")
-            return result
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON Parse Error from Gemini: {str(e)}")
-            print(f"   Gemini response was: {response.text[:200]}")
-            return {"isJobVideo": False, "openings": []}
-        except Exception as e:
-            print(f"❌ Gemini Error: {type(e).__name__}: {str(e)}")
-            return {"isJobVideo": False, "openings": []}
+            answer = self.gemini.generate_json(prompt, VIDEO_RESULT_RESPONSE_SCHEMA)
+        except GeminiUnavailable as e:
+            print(f"❌ Gemini extraction failed: {str(e)}")
+            return self._failed(str(e))
 
-    def process_video_for_jobs(self, video_id: str) -> dict:
+        if not self._is_video_result(answer):
+            print(f"❌ Gemini answer does not match the schema: {str(answer)[:200]}")
+            return self._failed("answer does not match the response schema")
+
+        result = self._with_status(answer)
+        print(f"✅ Successfully extracted: status={result['status']}, openings={len(result['openings'])}")
+        if cache_key:
+            self.extraction_cache.set(cache_key, video_id, answer)
+        return result
+
+    @staticmethod
+    def _with_status(result: dict) -> dict:
+        openings = result.get("openings") or []
+        found = bool(result.get("isJobVideo")) and bool(openings)
+        return {
+            "status": "ok" if found else "empty",
+            "isJobVideo": bool(result.get("isJobVideo")),
+            "openings": openings
+        }
+
+    @staticmethod
+    def _failed(error: str) -> dict:
+        return {"status": "failed", "isJobVideo": False, "openings": [], "error": error}
+
+    @staticmethod
+    def _is_video_result(result) -> bool:
+        return (
+            isinstance(result, dict)
+            and isinstance(result.get("isJobVideo"), bool)
+            and isinstance(result.get("openings"), list)
+        )
+
+    @staticmethod
+    def pack_extraction_batches(items: list, max_videos: int = GEMINI_BATCH_MAX_VIDEOS,
+                                token_budget: int = GEMINI_BATCH_TOKEN_BUDGET) -> list:
+        """Group videos into batches bounded by count and estimated prompt tokens."""
+        batches = []
+        current, used = [], 0
+        for item in items:
+            cost = estimate_tokens(item["title"] + item["description"] + item["transcript"]) + 30
+            if current and (len(current) >= max_videos or used + cost > token_budget):
+                batches.append(current)
+                current, used = [], 0
+            current.append(item)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _extract_batch_call(self, batch: list) -> dict:
+        """One Gemini call for several videos; returns the parsed per-video results that are valid."""
+        sections = "\n\n".join(
+            f"""=== VIDEO {item["videoId"]} ===
+Video Title:
+{item["title"]}
+
+Video Description:
+{item["description"]}
+
+Video Transcript (long transcripts are trimmed to their most relevant excerpts, each prefixed with [mm:ss]):
+{item["transcript"]}
+=== END VIDEO {item["videoId"]} ==="""
+            for item in batch
+        )
+        prompt = f"""
+You are an AI assistant that extracts job and internship openings from YouTube videos.
+Below are {len(batch)} independent videos, each between "=== VIDEO <id> ===" and "=== END VIDEO <id> ===".
+Treat every video separately: never move an opening from one video to another.
+
+{sections}
+
+Your Tasks (for EACH video):
+1. Determine whether the video contains one or more genuine job or internship openings.
+{EXTRACTION_RULES}
+
+Answer with one entry in "videos" per video, carrying its videoId exactly as given above.
+"""
+        answer = self.gemini.generate_json(prompt, BATCH_RESULT_RESPONSE_SCHEMA)
+
+        parsed = {}
+        for entry in answer.get("videos") or []:
+            if isinstance(entry, dict) and self._is_video_result(entry):
+                parsed.setdefault(entry.get("videoId"), {
+                    "isJobVideo": entry["isJobVideo"],
+                    "openings": entry["openings"]
+                })
+
+        return {item["videoId"]: parsed[item["videoId"]] for item in batch if item["videoId"] in parsed}
+
+    def extract_jobs_batch(self, items: list) -> dict:
+        """
+        Extract jobs for several videos with as few Gemini calls as possible.
+
+        `items` are dicts with "videoId", "title", "description" and
+        "transcript". Cached videos are answered from the extraction cache,
+        the rest are packed into batched prompts. A video whose section is
+        missing or malformed in the batched answer falls back to
+        extract_jobs_with_gemini on its own, unless the circuit breaker has
+        opened, in which case it is reported as failed straight away.
+
+        Returns {videoId: {"status", "isJobVideo", "openings"}}.
         """
-        Process a video and extract job openings.
-        
+        results = {}
+        pending = []
+        cache_keys = {}
+
+        for item in items:
+            if self.extraction_cache:
+                key = self.extraction_cache.key_for(
+                    item["videoId"], item["title"], item["description"], item["transcript"],
+                    PROMPT_VERSION, self.gemini_model
+                )
+                cached = self.extraction_cache.get(key)
+                if cached is not None:
+                    print(f"♻️  Using cached extraction for {item['videoId']}")
+                    results[item["videoId"]] = self._with_status(cached)
+                    continue
+                cache_keys[item["videoId"]] = key
+            pending.append(item)
+
+        for batch in self.pack_extraction_batches(pending):
+            if len(batch) == 1:
+                parsed = {}
+            else:
+                print(f"Extracting {len(batch)} videos in one call: {[item['videoId'] for item in batch]}")
+                try:
+                    parsed = self._extract_batch_call(batch)
+                except GeminiUnavailable as e:
+                    print(f"❌ Gemini batch failed: {str(e)}")
+                    parsed = {}
+
+            for item in batch:
+                video_id = item["videoId"]
+                if video_id in parsed:
+                    results[video_id] = self._with_status(parsed[video_id])
+                    if video_id in cache_keys:
+                        self.extraction_cache.set(cache_keys[video_id], video_id, parsed[video_id])
+                elif self.gemini.breaker_open:
+                    results[video_id] = self._failed("circuit breaker is open")
+                else:
+                    if len(batch) > 1:
+                        print(f"   ↩️  Falling back to single-video extraction for {video_id}")
+                    results[video_id] = self.extract_jobs_with_gemini(
+                        item["title"],
+                        item["description"],
+                        item["transcript"],
+                        video_id=video_id
+                    )
+
+        return results
+
+    def fetch_video_inputs(self, video_id: str) -> dict:
+        """
+        Fetch everything Gemini needs for a video (transcript, title, description),
+        plus "transcriptStats" describing how much of the transcript was trimmed.
+
         Note: If transcript is not available (disabled captions, age-restricted, etc),
         we still try to extract jobs from title and description using Gemini.
         """
-        transcript = self.get_transcript(video_id)
-        
+        entry = self.get_transcript_entry(video_id)
+        # Long transcripts are cut down to their most job-relevant windows;
+        # title and description are always passed in full
+        selection = select_transcript(entry["segments"])
+        transcript = selection["text"]
+
         if not transcript:
-            print(f"   ⚠️  Transcript not available for {video_id}, trying with title/description only")
-            transcript = ""
+            print(f"   ⚠️  Transcript not available for {video_id} ({entry['status']}: {entry['reason']}), "
+                  f"trying with title/description only")
 
         meta = self.get_title_description(video_id)
+        return {
+            "title": meta["title"],
+            "description": meta["description"],
+            "transcript": transcript,
+            "transcriptStats": selection["stats"]
+        }
+
+    def process_video_for_jobs(self, video_id: str) -> dict:
+        """Process a video and extract job openings."""
+        inputs = self.fetch_video_inputs(video_id)
         return self.extract_jobs_with_gemini(
-            meta["title"],
-            meta["description"],
-            transcript
+            inputs["title"],
+            inputs["description"],
+            inputs["transcript"],
+            video_id=video_id
         )
 
     def process_channel(self, channel_id: str, max_results: int = 5) -> list:
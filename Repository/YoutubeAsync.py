@@ -0,0 +1,228 @@
+import os
+import asyncio
+import threading
+import httpx
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+# Deadline of one API call, connection setup included
+YOUTUBE_TIMEOUT_SECONDS = float(os.getenv("YOUTUBE_TIMEOUT_SECONDS", "15"))
+# Keep-alive connections shared by all concurrent calls
+YOUTUBE_MAX_CONNECTIONS = int(os.getenv("YOUTUBE_MAX_CONNECTIONS", "10"))
+
+# videos().list accepts at most 50 comma-separated IDs per call
+VIDEOS_LIST_MAX_IDS = 50
+PLAYLIST_PAGE_SIZE = 50
+
+
+class YoutubeApiError(Exception):
+    """Non-2xx answer from the YouTube Data API."""
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(f"YouTube API {status}: {reason}")
+        self.status = status
+        self.reason = reason
+
+
+class YoutubeAsync:
+    """
+    Async client for the YouTube Data API endpoints the crawler uses:
+    search.list, videos.list, playlistItems.list and channels.list.
+
+    Requests go straight to the REST API over one pooled httpx.AsyncClient
+    (keep-alive, gzip) instead of through discovery-built request objects,
+    and every call has its own deadline. The high-level methods return the
+    same shapes as their counterparts on Youtube.
+
+    The pooled connection belongs to the event loop that first uses it, so
+    either await the coroutines from one loop, or hand them over from
+    synchronous code with run(), which executes them on the client's own
+    loop thread.
+    """
+
+    def __init__(self, api_key: str | None = None, timeout: float = YOUTUBE_TIMEOUT_SECONDS,
+                 max_connections: int = YOUTUBE_MAX_CONNECTIONS):
+        self.api_key = api_key or os.getenv("GCP_API_KEY")
+        if not self.api_key:
+            raise ValueError("GCP_API_KEY not found")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = None
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=YOUTUBE_API_URL,
+                # Google only compresses responses for user agents containing "gzip"
+                headers={"Accept-Encoding": "gzip", "User-Agent": "job-alerts (gzip)"},
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        return self._client
+
+    def run(self, coroutine):
+        """Run a coroutine of this client on its loop thread and wait for the result."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="youtube-async", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _get(self, resource: str, params: dict, etag: str | None = None,
+                   timeout: float | None = None) -> dict | None:
+        """GET one endpoint; returns None for 304 Not Modified."""
+        headers = {"If-None-Match": etag} if etag else None
+        query = {k: v for k, v in params.items() if v is not None}
+        query["key"] = self.api_key
+        response = await asyncio.wait_for(
+            self._http().get(f"/{resource}", params=query, headers=headers),
+            timeout or self.timeout
+        )
+        if response.status_code == 304:
+            return None
+        if response.status_code >= 400:
+            try:
+                reason = response.json()["error"]["message"]
+            except (ValueError, KeyError, TypeError):
+                reason = response.reason_phrase
+            raise YoutubeApiError(response.status_code, reason)
+        return response.json()
+
+    # ================== ENDPOINTS ==================
+
+    async def search_list(self, timeout: float | None = None, **params) -> dict:
+        return await self._get("search", params, timeout=timeout)
+
+    async def videos_list(self, timeout: float | None = None, **params) -> dict:
+        return await self._get("videos", params, timeout=timeout)
+
+    async def playlist_items_list(self, etag: str | None = None, timeout: float | None = None,
+                                  **params) -> dict | None:
+        return await self._get("playlistItems", params, etag=etag, timeout=timeout)
+
+    async def channels_list(self, timeout: float | None = None, **params) -> dict:
+        return await self._get("channels", params, timeout=timeout)
+
+    # ================== HIGH LEVEL ==================
+
+    async def get_recent_videos(self, channel_id: str, max_results: int = 5,
+                                published_after: str | None = None) -> list:
+        """Latest videos of a channel via search.list, shaped like Youtube.get_recent_videos."""
+        response = await self.search_list(
+            part="snippet",
+            channelId=channel_id,
+            order="date",
+            maxResults=max_results,
+            type="video",
+            publishedAfter=published_after
+        )
+        return [
+            {
+                "videoId": item["id"]["videoId"],
+                "title": item["snippet"]["title"],
+                "description": item["snippet"]["description"],
+                "publishedAt": item["snippet"]["publishedAt"]
+            }
+            for item in response.get("items", [])
+        ]
+
+    async def get_uploads_playlist_id(self, channel_id: str) -> str:
+        response = await self.channels_list(part="contentDetails", id=channel_id)
+        if not response.get("items"):
+            raise ValueError(f"Channel not found: {channel_id}")
+        return response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    async def crawl_uploads(self, channel_id: str, published_after: str | None = None,
+                            etag: str | None = None, uploads_playlist_id: str | None = None,
+                            max_videos: int = 200) -> dict:
+        """Same walk over the uploads playlist as Youtube.crawl_uploads, with the same result."""
+        playlist_id = uploads_playlist_id or await self.get_uploads_playlist_id(channel_id)
+
+        videos = []
+        first_etag = etag
+        page_token = None
+        pages = 0
+
+        while True:
+            response = await self.playlist_items_list(
+                etag=etag if pages == 0 else None,
+                part="snippet,contentDetails",
+                playlistId=playlist_id,
+                maxResults=PLAYLIST_PAGE_SIZE,
+                pageToken=page_token
+            )
+            if response is None:
+                return {"videos": [], "etag": etag, "uploadsPlaylistId": playlist_id,
+                        "notModified": True, "pages": 1}
+
+            pages += 1
+            if pages == 1:
+                first_etag = response.get("etag")
+
+            reached_cursor = False
+            for item in response.get("items", []):
+                published_at = item.get("contentDetails", {}).get("videoPublishedAt")
+                if not published_at:
+                    continue
+                if published_after and published_at <= published_after:
+                    reached_cursor = True
+                    continue
+                videos.append({
+                    "videoId": item["contentDetails"]["videoId"],
+                    "title": item["snippet"]["title"],
+                    "description": item["snippet"]["description"],
+                    "publishedAt": published_at
+                })
+
+            page_token = response.get("nextPageToken")
+            if reached_cursor or not page_token or len(videos) >= max_videos:
+                break
+
+        videos.sort(key=lambda v: v["publishedAt"], reverse=True)
+        return {
+            "videos": videos[:max_videos],
+            "etag": first_etag,
+            "uploadsPlaylistId": playlist_id,
+            "notModified": False,
+            "pages": pages
+        }
+
+    async def get_snippets(self, video_ids: list) -> dict:
+        """
+        Full snippets of many videos, one videos.list call per 50 IDs, all
+        calls in flight at once. Deleted or private videos map to None.
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        chunks = [video_ids[i:i + VIDEOS_LIST_MAX_IDS] for i in range(0, len(video_ids), VIDEOS_LIST_MAX_IDS)]
+        responses = await asyncio.gather(*(
+            self.videos_list(part="snippet", id=",".join(chunk), maxResults=len(chunk))
+            for chunk in chunks
+        ))
+
+        snippets = dict.fromkeys(video_ids)
+        for response in responses:
+            for item in response.get("items", []):
+                snippets[item["id"]] = item["snippet"]
+        return snippets
+
+    async def get_videos_metadata(self, video_ids: list) -> dict:
+        """{video_id: {"title", "description"}}, like Youtube.get_videos_metadata."""
+        snippets = await self.get_snippets(video_ids)
+        return {
+            video_id: {"title": (s or {}).get("title", ""), "description": (s or {}).get("description", "")}
+            for video_id, s in snippets.items()
+        }
+
+    async def get_title_description(self, video_id: str) -> dict:
+        return (await self.get_videos_metadata([video_id]))[video_id]
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
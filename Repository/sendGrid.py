@@ -1,6 +1,11 @@
 import os
+import re
+import json
+from functools import lru_cache
+from itertools import islice
 from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, ReplyTo
+from sendgrid.helpers.mail import Mail, ReplyTo, Personalization, To, Substitution
+from python_http_client.exceptions import HTTPError
 from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
@@ -9,6 +14,149 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 
 BASE_URL = os.getenv("BASE_URL", "http://localhost:8001")
 
+# SendGrid accepts at most 1000 personalizations per /mail/send request
+MAX_PERSONALIZATIONS = 1000
+SEND_BATCH_SIZE = min(int(os.getenv("SENDGRID_BATCH_SIZE", str(MAX_PERSONALIZATIONS))), MAX_PERSONALIZATIONS)
+JOB_ALERT_TEMPLATE_ID = os.getenv("SENDGRID_JOB_ALERT_TEMPLATE_ID")
+# "sync" sends through SendGridAPIClient one request at a time, "async" through AsyncSendGridSender
+SENDGRID_BACKEND = os.getenv("SENDGRID_BACKEND", "sync")
+
+# Substitution tag swapped for each recipient's own unsubscribe link
+UNSUBSCRIBE_TAG = "-unsubscribeLink-"
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class CompiledTemplate:
+    """
+    An email template split once into literal text and `{{ name }}` slots.
+
+    Rendering is a single join instead of one `str.replace` pass over the
+    whole document per placeholder. Slots without a value are kept as-is.
+    """
+
+    def __init__(self, parts: list):
+        # Even indexes are literal text, odd indexes are placeholder names
+        self.parts = parts
+
+    @classmethod
+    def from_source(cls, source: str) -> "CompiledTemplate":
+        return cls(PLACEHOLDER_PATTERN.split(source))
+
+    def partial(self, **values) -> "CompiledTemplate":
+        """Fill the given slots and merge the surrounding literals."""
+        parts = [self.parts[0]]
+        for i in range(1, len(self.parts), 2):
+            name, literal = self.parts[i], self.parts[i + 1]
+            if name in values:
+                parts[-1] += str(values[name]) + literal
+            else:
+                parts.extend([name, literal])
+        return CompiledTemplate(parts)
+
+    def render(self, **values) -> str:
+        out = []
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                out.append(part)
+            elif part in values:
+                out.append(str(values[part]))
+            else:
+                out.append("{{ " + part + " }}")
+        return "".join(out)
+
+
+@lru_cache(maxsize=None)
+def compile_template(template_name: str) -> CompiledTemplate:
+    """Read and compile a template from templates/ once per process."""
+    with open(TEMPLATES_DIR / template_name, "r", encoding="utf-8") as f:
+        return CompiledTemplate.from_source(f.read())
+
+
+class PreparedJobAlert:
+    """
+    A job alert rendered once per set of openings (one per run, or one per
+    matched subset when subscribers have preferences).
+
+    Everything except the unsubscribe link is baked in at construction, so
+    `finalize()` per recipient only joins a few strings.
+    """
+
+    def __init__(self, openings: list):
+        self.openings = openings
+        self.job_count = len(openings)
+        self.subject = f"🚨 New Job Openings ({self.job_count})"
+        self.job_cards_html = "".join(_render_job_card(job) for job in openings)
+        self.template = compile_template("job_alert.html").partial(
+            JOB_CARDS=self.job_cards_html,
+            year=datetime.now().year,
+            jobCount=self.job_count
+        )
+
+    def finalize(self, unsubscribe_link: str) -> str:
+        return self.template.render(unsubscribeLink=unsubscribe_link)
+
+
+def _render_job_card(job: dict) -> str:
+    skills = ", ".join(job.get("requiredSkills", [])) or "Not specified"
+    duration_html = f"<span>⏳ {job.get('duration')}</span>" if job.get("duration") else ""
+
+    return f"""
+            <div class="job-card">
+              <div class="job-title">{job.get("role", "N/A")}</div>
+              <div class="company">{job.get("company", "N/A")}</div>
+
+              <div class="meta">
+                <span>📌 {job.get("employmentType", "N/A")}</span>
+                <span>🏠 {job.get("workMode", "N/A")}</span>
+                <span>📍 {job.get("location", "N/A")}</span>
+                {duration_html}
+              </div>
+
+              <div class="skills">
+                <strong>Skills:</strong> {skills}
+              </div>
+
+              <div class="summary">
+                {job.get("summary", "No description available")}
+              </div>
+
+              <a class="apply-btn" href="{job.get("applyLink", "#")}" target="_blank">
+                Apply Now →
+              </a>
+            </div>
+            """
+
+def _http_error_text(error: HTTPError) -> str:
+    body = error.body.decode("utf-8", "replace") if isinstance(error.body, bytes) else error.body
+    return f"{error.status_code}: {body}"
+
+
+def _failed_entries(recipients: list, error: Exception) -> list:
+    """
+    Failed-recipient entries {"email", "error", "code", "recipientError"}.
+    "recipientError" is True only for a 400 that points at the recipient
+    (e.g. an invalid address), i.e. one that resending cannot fix.
+    """
+    if isinstance(error, HTTPError):
+        text, code = _http_error_text(error), error.status_code
+        recipient_error = code == 400 and _is_recipient_error(error)
+    else:
+        text, code, recipient_error = str(error), None, False
+    return [{"email": r["email"], "error": text, "code": code, "recipientError": recipient_error}
+            for r in recipients]
+
+
+def _is_recipient_error(error: HTTPError) -> bool:
+    """Whether a 400 names a recipient field (personalizations.N...), not the payload as a whole."""
+    try:
+        errors = json.loads(error.body)["errors"]
+    except (ValueError, KeyError, TypeError):
+        return False
+    return any(str((e or {}).get("field") or "").startswith("personalizations") for e in errors)
+
+
 class SendGridService:
     def __init__(self):
         self.api_key = os.getenv("SENDGRID_API_KEY")
@@ -18,29 +166,38 @@ class SendGridService:
         
         self.from_email = ("yuvasrisai18@gmail.com", "Job Alerts")
         self.client = SendGridAPIClient(self.api_key)
+        self.async_sender = None
+        if SENDGRID_BACKEND == "async":
+            from Repository.SendGridAsync import AsyncSendGridSender
+            self.async_sender = AsyncSendGridSender(self.api_key)
+
+    def _load_template(self, template_name: str) -> CompiledTemplate:
+        return compile_template(template_name)
 
-    def _load_template(self, template_name: str) -> str:
-        path = f"templates/{template_name}"
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
+    def _message(self, to_email: str, subject: str, html_content: str) -> Mail:
+        return Mail(
+            from_email=self.from_email,
+            to_emails=to_email,
+            subject=subject,
+            html_content=html_content
+        )
 
     def _send(self, to_email: str, subject: str, html_content: str):
+        status_code = self._deliver(self._message(to_email, subject, html_content))
+        print("E-Mail has been sent")
+        return status_code
+
+    def _deliver(self, message: Mail):
         if not self.api_key:
             raise ValueError("SENDGRID_API_KEY is not configured")
-        
+
         try:
-            message = Mail(
-                from_email=self.from_email,
-                to_emails=to_email,
-                subject=subject,
-                html_content=html_content
-            )
             message.reply_to = ReplyTo("noreply@sendgrid.net")
-
+            if self.async_sender:
+                return self.async_sender.send(message.get())
             response = self.client.send(message)
-            print("E-Mail has been sent")
             return response.status_code
-        
+
         except Exception as e:
             error_message = str(e)
             if "403" in error_message or "Forbidden" in error_message:
@@ -56,10 +213,9 @@ class SendGridService:
     def send_verification_email(self, email: str, verify_link: str):
         template = self._load_template("verify_subscription.html")
         print(verify_link)
-        html = (
-            template
-            .replace("{{ verifyLink }}", verify_link)
-            .replace("{{ year }}", str(datetime.now().year))
+        html = template.render(
+            verifyLink=verify_link,
+            year=datetime.now().year
         )
         
         return self._send(
@@ -71,10 +227,7 @@ class SendGridService:
     def send_subscription_confirmed_email(self, email: str):
         template = self._load_template("subscription_confirmed.html")
 
-        html = (
-            template
-            .replace("{{ year }}", str(datetime.now().year))
-        )
+        html = template.render(year=datetime.now().year)
 
         return self._send(
             to_email=email,
@@ -82,66 +235,192 @@ class SendGridService:
             html_content=html
         )
 
-    def send_job_alert_email(self, email: str, openings: list, unsubscribe_token: str):
-        template = self._load_template("job_alert.html")
+    def prepare_job_alert(self, openings: list) -> PreparedJobAlert:
+        """Render the shared part of a job alert once for the whole run."""
+        return PreparedJobAlert(openings)
 
-        job_cards_html = ""
+    def send_job_alert_email(
+        self,
+        email: str,
+        openings: list,
+        unsubscribe_token: str,
+        prepared: PreparedJobAlert | None = None
+    ):
+        prepared = prepared or self.prepare_job_alert(openings)
+        unsubscribe_link = f"{BASE_URL}/unsubscribe/{unsubscribe_token}"
 
-        for job in openings:
-            skills = ", ".join(job.get("requiredSkills", [])) or "Not specified"
-            duration_html = f"<span>⏳ {job.get('duration')}</span>" if job.get("duration") else ""
+        return self._send(
+            to_email=email,
+            subject=prepared.subject,
+            html_content=prepared.finalize(unsubscribe_link)
+        )
 
-            card = f"""
-            <div class="job-card">
-              <div class="job-title">{job.get("role", "N/A")}</div>
-              <div class="company">{job.get("company", "N/A")}</div>
+    def send_job_alert_emails(self, recipients: list, openings: list,
+                              prepared: PreparedJobAlert | None = None) -> tuple:
+        """
+        Send one individual job alert per recipient ({"email", "unsubscribeToken"}).
 
-              <div class="meta">
-                <span>📌 {job.get("employmentType", "N/A")}</span>
-                <span>🏠 {job.get("workMode", "N/A")}</span>
-                <span>📍 {job.get("location", "N/A")}</span>
-                {duration_html}
-              </div>
+        With the async backend all requests are handed to the sender at once
+        and go out concurrently under its rate limit; otherwise they are sent
+        one after another. Returns (succeeded_emails, failed_entries) like a
+        bulk batch.
+        """
+        prepared = prepared or self.prepare_job_alert(openings)
+        messages = []
+        for recipient in recipients:
+            message = self._message(
+                recipient["email"],
+                prepared.subject,
+                prepared.finalize(f"{BASE_URL}/unsubscribe/{recipient['unsubscribeToken']}")
+            )
+            message.reply_to = ReplyTo("noreply@sendgrid.net")
+            messages.append(message)
 
-              <div class="skills">
-                <strong>Skills:</strong> {skills}
-              </div>
+        if self.async_sender:
+            outcomes = self.async_sender.send_many([message.get() for message in messages])
+        else:
+            outcomes = []
+            for message in messages:
+                try:
+                    outcomes.append(self.client.send(message).status_code)
+                except Exception as e:
+                    outcomes.append(e)
 
-              <div class="summary">
-                {job.get("summary", "No description available")}
-              </div>
+        succeeded, failed = [], []
+        for recipient, outcome in zip(recipients, outcomes):
+            if isinstance(outcome, Exception):
+                failed.extend(_failed_entries([recipient], outcome))
+            else:
+                succeeded.append(recipient["email"])
+        return succeeded, failed
 
-              <a class="apply-btn" href="{job.get("applyLink", "#")}" target="_blank">
-                Apply Now →
-              </a>
-            </div>
-            """
+    def delivery_stats(self, reset: bool = False) -> dict | None:
+        """Throughput histogram of the async backend since the last reset (None for sync)."""
+        return self.async_sender.stats(reset=reset) if self.async_sender else None
 
-            job_cards_html += card
+    def close(self):
+        if self.async_sender:
+            self.async_sender.close()
 
-        unsubscribe_link = f"{BASE_URL}/unsubscribe/{unsubscribe_token}"
+    def _job_alert_batch_message(self, recipients: list, subject: str, html: str | None,
+                                 template_id: str | None, template_data: dict | None) -> Mail:
+        message = Mail(from_email=self.from_email, subject=subject)
 
-        html = (
-            template
-            .replace("{{ JOB_CARDS }}", job_cards_html)
-            .replace("{{ unsubscribeLink }}", unsubscribe_link)
-            .replace("{{ year }}", str(datetime.now().year))
-            .replace("{{ jobCount }}", str(len(openings)))
-        )
+        if template_id:
+            message.template_id = template_id
+        else:
+            message.add_content(html, "text/html")
 
-        return self._send(
-            to_email=email,
-            subject=f"🚨 New Job Openings ({len(openings)})",
-            html_content=html
-        )
+        for i, recipient in enumerate(recipients):
+            unsubscribe_link = f"{BASE_URL}/unsubscribe/{recipient['unsubscribeToken']}"
+            personalization = Personalization()
+            personalization.add_to(To(recipient["email"]))
+
+            if template_id:
+                personalization.dynamic_template_data = {
+                    **template_data,
+                    "unsubscribeLink": unsubscribe_link
+                }
+            else:
+                personalization.add_substitution(Substitution(UNSUBSCRIBE_TAG, unsubscribe_link))
+
+            message.add_personalization(personalization, index=i)
+
+        return message
+
+    def _send_job_alert_batch(self, recipients: list, subject: str, html: str | None,
+                              template_id: str | None, template_data: dict | None) -> tuple:
+        """
+        Send one batch and return (succeeded_emails, failed_entries), where a
+        failed entry is {"email", "error", "code", "recipientError"} (see
+        _failed_entries) and "code" is the HTTP status SendGrid answered with
+        (None when no response was received).
+
+        SendGrid accepts or rejects a request as a whole, so a 400 on a
+        multi-recipient batch that points at a personalization (typically one
+        malformed address) is bisected until the offending recipients are
+        isolated. Any other error, including a 400 about the payload itself
+        (template ID, content, size), fails the whole batch in one request.
+        """
+        message = self._job_alert_batch_message(recipients, subject, html, template_id, template_data)
+
+        try:
+            self._deliver(message)
+            return [r["email"] for r in recipients], []
+
+        except HTTPError as e:
+            if e.status_code == 400 and len(recipients) > 1 and _is_recipient_error(e):
+                mid = len(recipients) // 2
+                left_ok, left_failed = self._send_job_alert_batch(
+                    recipients[:mid], subject, html, template_id, template_data
+                )
+                right_ok, right_failed = self._send_job_alert_batch(
+                    recipients[mid:], subject, html, template_id, template_data
+                )
+                return left_ok + right_ok, left_failed + right_failed
+
+            return [], _failed_entries(recipients, e)
+
+        except Exception as e:
+            return [], _failed_entries(recipients, e)
+
+    def send_job_alert_bulk(
+        self,
+        recipients: list,
+        openings: list,
+        batch_size: int = SEND_BATCH_SIZE,
+        template_id: str | None = JOB_ALERT_TEMPLATE_ID,
+        prepared: PreparedJobAlert | None = None
+    ) -> dict:
+        """
+        Send the job alert to many recipients using one request per batch.
+
+        `recipients` is an iterable of {"email", "unsubscribeToken"} dicts and
+        is consumed one batch at a time, so it can be a Firestore stream. Each
+        batch carries the shared HTML once plus one personalization per
+        recipient, whose unsubscribe link is filled in through a substitution
+        tag. With `template_id` set, the SendGrid dynamic template is used
+        instead and openings are passed as template data.
+
+        Returns per-batch succeeded/failed recipients and overall totals.
+        """
+        batch_size = max(1, min(batch_size, MAX_PERSONALIZATIONS))
+        prepared = prepared or self.prepare_job_alert(openings)
+        subject = prepared.subject
+
+        html = None
+        template_data = None
+        if template_id:
+            template_data = {
+                "openings": openings,
+                "jobCount": len(openings),
+                "year": datetime.now().year
+            }
+        else:
+            html = prepared.finalize(UNSUBSCRIBE_TAG)
+
+        batches = []
+        recipients = iter(recipients)
+        while chunk := list(islice(recipients, batch_size)):
+            succeeded, failed = self._send_job_alert_batch(chunk, subject, html, template_id, template_data)
+            batches.append({
+                "index": len(batches),
+                "size": len(chunk),
+                "succeeded": succeeded,
+                "failed": failed
+            })
+            print(f"E-Mail batch {len(batches)}: {len(succeeded)} sent, {len(failed)} failed")
+
+        return {
+            "batches": batches,
+            "sent": sum(len(b["succeeded"]) for b in batches),
+            "failed": sum(len(b["failed"]) for b in batches)
+        }
 
     def send_unsubscribe_email(self, email: str):
         template = self._load_template("unsubscribe.html")
 
-        html = (
-            template
-            .replace("{{ year }}", str(datetime.now().year))
-        )
+        html = template.render(year=datetime.now().year)
 
         return self._send(
             to_email=email,
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the web app.
+
+Every sample runs in a fresh interpreter and measures:
+  - import:  `import main` (FastAPI app, routes, lazy service registry)
+  - first request and a repeat for each route in ROUTES, through
+    Starlette's TestClient (startup hooks included)
+
+Results are printed and written to bench_output.txt. A route answering
+with anything but 2xx fails the benchmark: timing an error page says
+nothing about the real route.
+
+Usage: python bench_startup.py [samples]
+"""
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+from pathlib import Path
+
+ROUTES = ["/", "/resubscribe", "/api/ready"]
+OUTPUT_PATH = Path(__file__).parent / "bench_output.txt"
+
+SAMPLE_SCRIPT = f"""
+import json, time
+started = time.perf_counter()
+import main
+timings = {{"import": time.perf_counter() - started}}
+
+from fastapi.testclient import TestClient
+statuses = {{}}
+with TestClient(main.app, raise_server_exceptions=False) as client:
+    for route in {ROUTES!r}:
+        for label in ("first", "repeat"):
+            started = time.perf_counter()
+            statuses[route] = client.get(route).status_code
+            timings[f"{{route}} {{label}}"] = time.perf_counter() - started
+    timings["statuses"] = statuses
+    timings["services"] = [n for n, s in main.Services.services.items() if s.initialized]
+print(json.dumps(timings))
+"""
+
+
+def run_sample() -> dict:
+    # Warm-up would add background work to the measured process
+    env = {**os.environ, "WARMUP_SERVICES": ""}
+    completed = subprocess.run(
+        [sys.executable, "-c", SAMPLE_SCRIPT],
+        cwd=Path(__file__).parent, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(samples: int = 5) -> int:
+    results = [run_sample() for _ in range(samples)]
+
+    errors = sorted({
+        f"{route} -> {status}"
+        for r in results for route, status in r["statuses"].items()
+        if not 200 <= status < 300
+    })
+    if errors:
+        print(f"❌ Non-2xx responses, no timings recorded: {', '.join(errors)}")
+        return 1
+
+    lines = [f"Cold start benchmark ({samples} samples, Python {sys.version.split()[0]})", ""]
+    lines.append(f"{'metric':<28}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for metric in [k for k in results[0] if k not in ("services", "statuses")]:
+        values = [r[metric] * 1000 for r in results]
+        lines.append(
+            f"{metric:<28}{statistics.median(values):>12.1f}{min(values):>10.1f}{max(values):>10.1f}"
+        )
+    lines.append("")
+    lines.append(f"Status codes: {results[-1]['statuses']}")
+    lines.append(f"Services initialized by these routes: {results[-1]['services'] or 'none'}")
+
+    report = "\n".join(lines)
+    print(report)
+    OUTPUT_PATH.write_text(report + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
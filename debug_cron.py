@@ -4,49 +4,58 @@
 from Repository.Youtube import Youtube
 from dotenv import load_dotenv
 import json
+import sys
 
 load_dotenv()
 
-# Test the video that's returning "No jobs found"
-video_id = "P-9izfdbKDU"
-
-print("="*60)
-print(f"Testing video: {video_id}")
-print("="*60)
+# Videos to test (python debug_cron.py <video_id> ...); default: the one returning "No jobs found"
+video_ids = sys.argv[1:] or ["P-9izfdbKDU"]
 
 yt = Youtube()
 
-# Step 1: Get transcript
-print("\n1️⃣  Fetching transcript...")
-transcript = yt.get_transcript(video_id)
-print(f"   Transcript length: {len(transcript)} chars")
-print(f"   First 100 chars: {transcript[:100]}")
-
-# Step 2: Get title and description
-print("\n2️⃣  Fetching title and description...")
-meta = yt.get_title_description(video_id)
-print(f"   Title: {meta['title']}")
-print(f"   Description length: {len(meta['description'])} chars")
-
-# Step 3: Extract jobs
-print("\n3️⃣  Extracting jobs with Gemini...")
-result = yt.extract_jobs_with_gemini(
-    meta["title"],
-    meta["description"],
-    transcript
-)
-
-print(f"\n   Result type: {type(result)}")
-print(f"   Full result:\n{json.dumps(result, indent=2)}")
-
-# Step 4: Check conditions
-print("\n4️⃣  Checking conditions...")
-print(f"   result: {result}")
-print(f"   isinstance(result, dict): {isinstance(result, dict)}")
-if result and isinstance(result, dict):
-    is_job_video = result.get("isJobVideo", False)
-    openings = result.get("openings", [])
-    print(f"   isJobVideo: {is_job_video}")
-    print(f"   openings: {openings}")
-    print(f"   len(openings): {len(openings) if openings else 0}")
-    print(f"   Condition (is_job_video and openings and len(openings) > 0): {is_job_video and openings and len(openings) > 0}")
+# Step 0: Download all transcripts at once, in parallel; they stay in the
+# transcript store, so a repeat session downloads nothing
+print("\n0️⃣  Prefetching transcripts...")
+for vid, entry in yt.prefetch_transcripts(video_ids).items():
+    print(f"   {vid}: {entry['status']}")
+
+for video_id in video_ids:
+    print("="*60)
+    print(f"Testing video: {video_id}")
+    print("="*60)
+
+    # Step 1: Get transcript, title and description (the same inputs the cron run uses)
+    print("\n1️⃣  Fetching transcript...")
+    inputs = yt.fetch_video_inputs(video_id)
+    transcript = inputs["transcript"]
+    print(f"   Transcript length: {len(transcript)} chars")
+    print(f"   First 100 chars: {transcript[:100]}")
+
+    # Step 2: Get title and description
+    print("\n2️⃣  Fetching title and description...")
+    print(f"   Title: {inputs['title']}")
+    print(f"   Description length: {len(inputs['description'])} chars")
+
+    # Step 3: Extract jobs (answered from the extraction cache when this video was seen before)
+    print("\n3️⃣  Extracting jobs with Gemini...")
+    result = yt.extract_jobs_with_gemini(
+        inputs["title"],
+        inputs["description"],
+        transcript,
+        video_id=video_id
+    )
+
+    print(f"\n   Result type: {type(result)}")
+    print(f"   Full result:\n{json.dumps(result, indent=2)}")
+
+    # Step 4: Check conditions
+    print("\n4️⃣  Checking conditions...")
+    print(f"   result: {result}")
+    print(f"   isinstance(result, dict): {isinstance(result, dict)}")
+    if result and isinstance(result, dict):
+        is_job_video = result.get("isJobVideo", False)
+        openings = result.get("openings", [])
+        print(f"   isJobVideo: {is_job_video}")
+        print(f"   openings: {openings}")
+        print(f"   len(openings): {len(openings) if openings else 0}")
+        print(f"   Condition (is_job_video and openings and len(openings) > 0): {is_job_video and openings and len(openings) > 0}")
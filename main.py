@@ -1,17 +1,16 @@
 from fastapi import FastAPI, Request, Form, HTTPException, Header
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
 from pathlib import Path
-from datetime import datetime, timezone
 from dotenv import load_dotenv
 import os
-import json
 
 load_dotenv()
 
-from Repository.Youtube import Youtube
-from Repository.Firebase import Firebase
-from Repository.sendGrid import SendGridService
+from Repository.JobCatalog import InvalidCursor, JOB_CATALOG_CACHE_CONTROL
+from Repository.SubscriberLifecycle import SubscriberNotFound, InvalidTransition
 from utils.helpers import (
     is_allowed_email,
     create_verification_token,
@@ -19,13 +18,59 @@ from utils.helpers import (
     create_unsubscribe_token,
     verify_unsubscribe_token
 )
+from utils.alert_matcher import parse_preferences
+from utils.services import ServiceRegistry
 
 
 app = FastAPI()
 
-YoutubeObj = Youtube()
-FirebaseObj = Firebase()
-SendGridObj = SendGridService()
+# ================== SERVICES ==================
+# Built on first use (SDK imports included), so importing the app and serving
+# routes that need no client stays fast on a cold start.
+
+def create_firebase():
+    from Repository.Firebase import Firebase
+    return Firebase()
+
+
+def create_youtube():
+    from Repository.Youtube import Youtube
+    return Youtube(firebase=FirebaseObj.resolve())
+
+
+def create_sendgrid():
+    from Repository.sendGrid import SendGridService
+    return SendGridService()
+
+
+def create_cron_runner():
+    from utils.cron_runner import CronRunner
+    return CronRunner(FirebaseObj, YoutubeObj, SendGridObj, outbox=OutboxObj)
+
+
+def create_job_catalog():
+    from Repository.JobCatalog import JobCatalog
+    return JobCatalog(FirebaseObj)
+
+
+def create_subscribers():
+    from Repository.SubscriberLifecycle import SubscriberLifecycle
+    return SubscriberLifecycle(FirebaseObj)
+
+
+def create_outbox():
+    from Repository.EmailOutbox import EmailOutbox
+    return EmailOutbox(FirebaseObj, SendGridObj)
+
+
+Services = ServiceRegistry()
+FirebaseObj = Services.register("firebase", create_firebase)
+YoutubeObj = Services.register("youtube", create_youtube)
+SendGridObj = Services.register("sendgrid", create_sendgrid)
+CronRunnerObj = Services.register("cron_runner", create_cron_runner)
+JobCatalogObj = Services.register("job_catalog", create_job_catalog)
+SubscribersObj = Services.register("subscribers", create_subscribers)
+OutboxObj = Services.register("outbox", create_outbox)
 
 BASE_DIR = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
@@ -33,48 +78,93 @@ templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 BASE_URL = os.getenv("BASE_URL", "http://localhost:8001")
 
 
+@app.on_event("startup")
+def warm_up_services():
+    # Builds the services listed in WARMUP_SERVICES on a background thread
+    Services.warm_up()
+    from Repository.EmailOutbox import OUTBOX_DRAIN_ON_STARTUP
+    if OUTBOX_DRAIN_ON_STARTUP:
+        # Picks up messages queued before a restart without waiting for a new one or the cron run
+        OutboxObj.start()
+
+
+@app.on_event("shutdown")
+def close_services():
+    if OutboxObj.initialized:
+        OutboxObj.stop()
+    # Closes the async SendGrid connection pool (SENDGRID_BACKEND=async)
+    if SendGridObj.initialized:
+        SendGridObj.close()
+
+
+@app.get("/api/ready")
+async def readiness():
+    """
+    Which service clients are initialized, and how long each took.
+    Answers 503 until every service in WARMUP_SERVICES is ready.
+    """
+    report = Services.readiness()
+    return JSONResponse(jsonable_encoder(report), status_code=200 if report["ready"] else 503)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def home_route(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return templates.TemplateResponse(request, "index.html")
 
 
 @app.get("/resubscribe", response_class=HTMLResponse)
 async def resubscribe_route(request: Request):
     """Display the re-subscribe form for users who previously unsubscribed"""
-    return templates.TemplateResponse("resubscribe.html", {"request": request})
+    return templates.TemplateResponse(request, "resubscribe.html")
 
 
 @app.post("/register")
-async def register_user(email: str = Form(...)):
+async def register_user(
+    email: str = Form(...),
+    workMode: str | None = Form(None),
+    employmentType: str | None = Form(None),
+    location: str | None = Form(None),
+    skills: str | None = Form(None)
+):
+    """
+    Register a new subscriber. The optional preference fields take
+    comma-separated values (e.g. workMode=Remote, skills=Python,React);
+    job alerts then only contain matching openings.
+    """
     email = email.lower().strip()
 
     if not is_allowed_email(email):
         raise HTTPException(status_code=400, detail="Invalid email")
 
-    if FirebaseObj.exists("subscribers", "email", email):
-        raise HTTPException(status_code=409, detail="Email already registered")
-
     verification_token = create_verification_token(email)
     unsubscribe_token = create_unsubscribe_token(email)
 
-    FirebaseObj.set_document(
-        "subscribers",
+    # Create-if-absent: one write, no check-then-write race. Firestore calls run
+    # in the threadpool so the event loop keeps serving other requests meanwhile
+    created = await run_in_threadpool(
+        SubscribersObj.register,
         email,
         {
-            "email": email,
-            "isVerified": False,
-            "subscribed": False,
             "unsubscribeToken": unsubscribe_token,
-            "createdAt": datetime.now(timezone.utc)
+            "preferences": parse_preferences(
+                workMode=workMode,
+                employmentType=employmentType,
+                location=location,
+                skills=skills
+            )
         }
     )
+    if not created:
+        raise HTTPException(status_code=409, detail="Email already registered")
 
     verify_link = f"{BASE_URL}/verify-email/{verification_token}"
     # print(verify_link)
-    SendGridObj.send_verification_email(
-        email=email,
-        verify_link=verify_link
-    )
+    # Sent by the outbox drainer; the request does not wait for SendGrid
+    if not await run_in_threadpool(OutboxObj.enqueue, "verification", email, {"verifyLink": verify_link}):
+        return JSONResponse(
+            {"message": "A verification email was already sent to this address recently"},
+            status_code=200
+        )
 
     return JSONResponse(
         {"message": "Verification email sent"},
@@ -88,15 +178,17 @@ async def verify_email(token: str, request: Request):
     if not email:
         raise HTTPException(status_code=400, detail="Invalid token")
 
-    FirebaseObj.update_document(
-        "subscribers",
-        email,
-        {"isVerified": True, "subscribed": True}
-    )
+    try:
+        # A Firestore transaction (possibly retried); keep it off the event loop
+        transition = await run_in_threadpool(SubscribersObj.activate, email)
+    except SubscriberNotFound:
+        raise HTTPException(status_code=404, detail="Subscriber not found")
+    print(f"✅ {email}: {transition['previous']} -> {transition['state']}")
 
     return templates.TemplateResponse(
+        request,
         "subscription_confirmed.html",
-        {"request": request, "email": email}
+        {"email": email}
     )
 
 
@@ -106,40 +198,59 @@ async def unsubscribe_user(token: str, request: Request):
     if not email:
         raise HTTPException(status_code=400, detail="Invalid token")
 
-    FirebaseObj.update_document(
-        "subscribers",
-        email,
-        {"subscribed": False}
-    )
+    try:
+        transition = await run_in_threadpool(SubscribersObj.unsubscribe, email)
+        print(f"👋 {email}: {transition['previous']} -> {transition['state']}")
+    except SubscriberNotFound:
+        raise HTTPException(status_code=404, detail="Subscriber not found")
+    except InvalidTransition as e:
+        # Never verified, so never emailed: nothing to stop
+        print(f"👋 {email}: {e}")
 
     return templates.TemplateResponse(
+        request,
         "unsubscribe.html",
-        {"request": request, "email": email}
+        {"email": email}
     )
 
 
 @app.post("/resubscribe")
-async def resubscribe_user(email: str = Form(...)):
+async def resubscribe_user(
+    email: str = Form(...),
+    workMode: str | None = Form(None),
+    employmentType: str | None = Form(None),
+    location: str | None = Form(None),
+    skills: str | None = Form(None)
+):
     """
     Handle re-subscription for users who previously unsubscribed.
     Checks if user exists and is not subscribed, then re-activates subscription.
+    Preference fields, when any is given, replace the stored preferences.
     """
     email = email.lower().strip()
 
     if not is_allowed_email(email):
         raise HTTPException(status_code=400, detail="Invalid email")
 
-    # Check if user exists in subscribers collection
-    existing_user = FirebaseObj.get_document("subscribers", email)
-    
-    if not existing_user:
+    preferences = None
+    if any(value is not None for value in (workMode, employmentType, location, skills)):
+        preferences = parse_preferences(
+            workMode=workMode,
+            employmentType=employmentType,
+            location=location,
+            skills=skills
+        )
+
+    # Existence and "not already active" are checked in the same transaction
+    # that stores the new preferences
+    try:
+        await run_in_threadpool(SubscribersObj.request_resubscribe, email, preferences)
+    except SubscriberNotFound:
         raise HTTPException(
             status_code=404, 
             detail="Email not found. Please register as a new subscriber."
         )
-
-    # Check if already subscribed
-    if existing_user.get("subscribed"):
+    except InvalidTransition:
         raise HTTPException(
             status_code=409, 
             detail="Email is already active. You're already receiving job alerts!"
@@ -148,12 +259,13 @@ async def resubscribe_user(email: str = Form(...)):
     # Create new verification token for re-activation
     verification_token = create_verification_token(email)
 
-    # Send re-subscription verification email
+    # Queue re-subscription verification email (dropped if one was queued or sent recently)
     verify_link = f"{BASE_URL}/verify-email/{verification_token}"
-    SendGridObj.send_verification_email(
-        email=email,
-        verify_link=verify_link
-    )
+    if not await run_in_threadpool(OutboxObj.enqueue, "verification", email, {"verifyLink": verify_link}):
+        raise HTTPException(
+            status_code=429,
+            detail="A verification email was already sent recently. Please check your inbox."
+        )
 
     return JSONResponse(
         {"message": "Re-subscription verification email sent"},
@@ -161,22 +273,8 @@ async def resubscribe_user(email: str = Form(...)):
     )
 
 
-@app.get("/api/cron/job-alert")
-async def cron_job_alert(x_cron_secret: str = Header(None)):
-    """
-    Protected cron endpoint for job alert scheduler.
-    Runs the job alert logic exactly once per request.
-    
-    Called by GitHub Actions every 6 hours.
-    
-    Security:
-    - Header: x-cron-secret
-    - Compare against environment variable: CRON_SECRET
-    - Returns HTTP 403 if invalid
-    - Returns JSON with execution details
-    """
-    
-    # ===== SECURITY: Validate cron secret =====
+def validate_cron_secret(x_cron_secret: str | None) -> JSONResponse | None:
+    """Return an error response when the x-cron-secret header is missing or wrong."""
     CRON_SECRET = os.getenv("CRON_SECRET")
     
     if not CRON_SECRET:
@@ -190,221 +288,120 @@ async def cron_job_alert(x_cron_secret: str = Header(None)):
             {"error": "Unauthorized"},
             status_code=403
         )
+    return None
+
+
+@app.get("/api/cron/job-alert")
+async def cron_job_alert(x_cron_secret: str = Header(None), continuation: str | None = None):
+    """
+    Protected cron endpoint for job alert scheduler.
+    Starts one job alert run in the background and returns its run ID at once;
+    if a run is already in progress, that run is returned instead.
+    
+    A run that used up CRON_TIME_BUDGET_SECONDS ends as "paused" with a
+    continuation token; the next call (with ?continuation=<token>, or without,
+    which resumes the pending checkpoint) continues where it stopped.
+    
+    Called by GitHub Actions, which then polls /api/cron/runs/{run_id}.
+    
+    Security:
+    - Header: x-cron-secret
+    - Compare against environment variable: CRON_SECRET
+    - Returns HTTP 403 if invalid
+    - Returns HTTP 202 with the run ID
+    """
+    
+    # ===== SECURITY: Validate cron secret =====
+    denied = validate_cron_secret(x_cron_secret)
+    if denied:
+        return denied
+    
+    run, started = CronRunnerObj.start(continuation=continuation)
+    print(f"🔔 [CRON] {'Started' if started else 'Already running'}: run {run.run_id}")
+    
+    return JSONResponse(
+        {
+            "status": "accepted" if started else "already_running",
+            "runId": run.run_id,
+            "statusUrl": f"/api/cron/runs/{run.run_id}"
+        },
+        status_code=202
+    )
+
+
+@app.get("/api/cron/runs/{run_id}")
+async def cron_run_status(run_id: str, x_cron_secret: str = Header(None)):
+    """
+    Progress of a job alert run: status (queued, running, succeeded, paused, failed),
+    current stage, live counters, and the final summary once it has finished.
+    """
+    denied = validate_cron_secret(x_cron_secret)
+    if denied:
+        return denied
+    
+    run = await run_in_threadpool(CronRunnerObj.get, run_id)
+    if run is None:
+        return JSONResponse({"error": "Run not found"}, status_code=404)
+    
+    return JSONResponse(jsonable_encoder(run), status_code=200)
+
+
+@app.get("/api/outbox/stats")
+async def outbox_stats(x_cron_secret: str = Header(None)):
+    """
+    Email outbox health: queue depth by status, age of the oldest queued
+    message, send lag percentiles and drainer counters.
+    """
+    denied = validate_cron_secret(x_cron_secret)
+    if denied:
+        return denied
+    
+    stats = await run_in_threadpool(OutboxObj.stats)
+    return JSONResponse(jsonable_encoder(stats), status_code=200)
+
+
+@app.get("/api/jobs")
+async def list_jobs(
+    request: Request,
+    employmentType: str | None = None,
+    workMode: str | None = None,
+    location: str | None = None,
+    skill: str | None = None,
+    cursor: str | None = None,
+    limit: int = 20
+):
+    """
+    Public, read-only catalog of the openings announced so far, newest first.
+    
+    Filters take comma-separated values (OR within a filter, AND across filters),
+    e.g. /api/jobs?employmentType=internship&skill=python,java&location=bangalore.
+    Pass the "nextCursor" of a page as ?cursor= to get the next one.
+    
+    Served from an in-memory index that syncs new openings from Firestore at
+    most once per JOB_CATALOG_REFRESH_SECONDS. Responses carry an ETag; a
+    request with a matching If-None-Match gets 304 without a body.
+    """
+    await run_in_threadpool(JobCatalogObj.refresh_if_stale)
+    
+    filters = {}
+    for facet, value in (("employmentType", employmentType), ("workMode", workMode),
+                         ("location", location), ("skill", skill)):
+        values = sorted({v.strip().lower() for v in (value or "").split(",") if v.strip()})
+        if values:
+            filters[facet] = values
     
     try:
-        print("\n" + "="*60)
-        print(f"🔔 [CRON] Starting job alert at {datetime.now(timezone.utc)}")
-        print("="*60)
-        
-        # ===== STEP 1: Configuration =====
-        CHANNEL_ID = "UCbEd9lNwkBGLFGz8ZxsZdVA"
-        MAX_VIDEOS = 3
-        
-        print(f"\n📋 [CRON] Configuration:")
-        print(f"   - Channel ID: {CHANNEL_ID}")
-        print(f"   - Max Videos: {MAX_VIDEOS}")
-        
-        # ===== STEP 2: Fetch state and get videos =====
-        print(f"\n📺 [CRON] Fetching videos...")
-        
-        state = FirebaseObj.get_document("system_state", "youtube")
-        last_processed_at = state.get("lastProcessedAt") if state else None
-        
-        print(f"   - Last processed: {last_processed_at or 'Never'}")
-        
-        videos = YoutubeObj.get_recent_videos(
-            CHANNEL_ID,
-            MAX_VIDEOS,
-            published_after=last_processed_at
-        )
-        
-        if not videos:
-            print("   ⚠️  No new videos found")
-            return JSONResponse(
-                {"status": "success", "message": "No new videos", "videos_processed": 0},
-                status_code=200
-            )
-        
-        print(f"   ✅ Found {len(videos)} video(s)")
-        for v in videos:
-            print(f"      📹 {v['title'][:50]}...")
-        
-        # ===== STEP 3: Extract jobs from videos =====
-        print(f"\n🔍 [CRON] Extracting jobs from videos...")
-        
-        all_openings = []
-        videos_with_jobs = 0
-        
-        for i, video in enumerate(videos, 1):
-            try:
-                print(f"\n   [{i}/{len(videos)}] Processing: {video['videoId']}")
-                
-                result = YoutubeObj.process_video_for_jobs(video["videoId"])
-                
-                # DEBUG: Print result structure
-                print(f"      Result type: {type(result)}, Result: {result}")
-                
-                if result and isinstance(result, dict):
-                    is_job_video = result.get("isJobVideo", False)
-                    openings = result.get("openings", [])
-                    
-                    print(f"      isJobVideo: {is_job_video}, Openings count: {len(openings) if openings else 0}")
-                    
-                    if is_job_video and openings and len(openings) > 0:
-                        job_count = len(openings)
-                        print(f"      ✅ Found {job_count} job opening(s)")
-                        all_openings.extend(openings)
-                        videos_with_jobs += 1
-                    else:
-                        print(f"      ℹ️  No jobs in this video (isJobVideo={is_job_video}, openings={len(openings) if openings else 0})")
-                else:
-                    print(f"      ⚠️  Invalid result format: {result}")
-                    
-            except json.JSONDecodeError as e:
-                print(f"      ❌ JSON Parse Error: {str(e)}")
-                print(f"         This usually means Gemini returned invalid JSON")
-                continue
-            except Exception as e:
-                print(f"      ❌ Error processing video: {type(e).__name__}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                continue
-        
-        if not all_openings:
-            print(f"\n📭 [CRON] No job openings found in any video")
-            
-            # Update state anyway
-            if videos:
-                latest_published_at = max(v["publishedAt"] for v in videos)
-                FirebaseObj.set_document(
-                    "system_state",
-                    "youtube",
-                    {"lastProcessedAt": latest_published_at}
-                )
-            
-            return JSONResponse(
-                {
-                    "status": "success",
-                    "message": "No jobs found",
-                    "videos_processed": len(videos),
-                    "videos_with_jobs": videos_with_jobs,
-                    "jobs_extracted": 0
-                },
-                status_code=200
-            )
-        
-        print(f"\n🎯 [CRON] Total jobs extracted: {len(all_openings)}")
-        
-        # ===== STEP 4: Get active subscribers =====
-        print(f"\n👥 [CRON] Fetching subscribers...")
-        
-        subscribers = FirebaseObj.get_all_documents("subscribers")
-        active = [
-            s for s in subscribers
-            if s.get("subscribed") and s.get("isVerified")
-        ]
-        
-        if not active:
-            print("   📭 No active subscribers")
-            
-            # Update state
-            if videos:
-                latest_published_at = max(v["publishedAt"] for v in videos)
-                FirebaseObj.set_document(
-                    "system_state",
-                    "youtube",
-                    {"lastProcessedAt": latest_published_at}
-                )
-            
-            return JSONResponse(
-                {
-                    "status": "success",
-                    "message": "No active subscribers",
-                    "videos_processed": len(videos),
-                    "videos_with_jobs": videos_with_jobs,
-                    "jobs_extracted": len(all_openings),
-                    "emails_sent": 0
-                },
-                status_code=200
-            )
-        
-        print(f"   Total subscribers: {len(subscribers)}")
-        print(f"   Active subscribers: {len(active)}")
-        print(f"   Emails to send: {[s.get('email') for s in active]}")
-        
-        # ===== STEP 5: Send job alerts =====
-        print(f"\n📧 [CRON] Sending job alerts...")
-        
-        emails_sent = 0
-        emails_failed = 0
-        
-        for i, sub in enumerate(active, 1):
-            try:
-                email = sub.get("email")
-                token = sub.get("unsubscribeToken")
-                
-                if not email or not token:
-                    print(f"   [{i}/{len(active)}] ⚠️  Skipping - missing data")
-                    emails_failed += 1
-                    continue
-                
-                SendGridObj.send_job_alert_email(
-                    email=email,
-                    openings=all_openings,
-                    unsubscribe_token=token
-                )
-                
-                print(f"   [{i}/{len(active)}] ✅ Sent to {email}")
-                emails_sent += 1
-                
-            except Exception as e:
-                print(f"   [{i}/{len(active)}] ❌ Failed: {str(e)}")
-                emails_failed += 1
-        
-        # ===== STEP 6: Update state =====
-        print(f"\n💾 [CRON] Updating state...")
-        
-        if videos:
-            latest_published_at = max(v["publishedAt"] for v in videos)
-            FirebaseObj.set_document(
-                "system_state",
-                "youtube",
-                {"lastProcessedAt": latest_published_at}
-            )
-            print(f"   ✅ State updated: {latest_published_at}")
-        
-        # ===== COMPLETION =====
-        print(f"\n🎉 [CRON] Job completed successfully!")
-        print(f"   - Videos processed: {len(videos)}")
-        print(f"   - Videos with jobs: {videos_with_jobs}")
-        print(f"   - Total jobs: {len(all_openings)}")
-        print(f"   - Emails sent: {emails_sent}")
-        print(f"   - Emails failed: {emails_failed}")
-        print("="*60 + "\n")
-        
-        return JSONResponse(
-            {
-                "status": "success",
-                "message": "Job alert completed",
-                "videos_processed": len(videos),
-                "videos_with_jobs": videos_with_jobs,
-                "jobs_extracted": len(all_openings),
-                "emails_sent": emails_sent,
-                "emails_failed": emails_failed
-            },
-            status_code=200
-        )
-        
-    except Exception as e:
-        print(f"\n❌ [CRON] FATAL ERROR: {str(e)}")
-        print("="*60 + "\n")
-        import traceback
-        traceback.print_exc()
-        
-        return JSONResponse(
-            {"error": str(e)},
-            status_code=500
-        )
+        page = JobCatalogObj.search(filters, cursor=cursor, limit=limit)
+    except InvalidCursor as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    
+    # The ETag is derived from the page itself, so it holds across workers and restarts
+    etag = page.pop("etag")
+    headers = {"ETag": etag, "Cache-Control": JOB_CATALOG_CACHE_CONTROL}
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse(jsonable_encoder(page), status_code=200, headers=headers)
 
 
 if __name__ == "__main__":
@@ -413,16 +410,37 @@ if __name__ == "__main__":
 
 """
 APPLICATION FLOW:
-1. Subscribe -> User enters email, stored in Firestore with isVerified=False
-2. Verification -> User receives verification email with JWT token
-3. Verify endpoint -> Validates token, sets isVerified=True and subscribed=True
-4. Cron job -> /api/cron/job-alert endpoint (called by GitHub Actions every 6 hours)
+1. Subscribe -> User enters email (and optional preferences: work mode, employment type,
+   location, skills), stored in Firestore with isVerified=False
+2. Verification -> Verification email with JWT token is queued in the Firestore
+   `email_outbox` collection and sent by a drainer thread started by the first queued
+   email, and by every cron run (GET /api/outbox/stats); a repeat within the dedup
+   window is not queued again and the caller is told so
+3. Verify endpoint -> Validates token, moves the subscriber to active (isVerified=True,
+   subscribed=True) in one transaction; Repository/SubscriberLifecycle.py holds the
+   unverified -> active -> unsubscribed -> active state machine
+4. Cron job -> /api/cron/job-alert starts a background run (called by GitHub Actions every 6 hours)
 5. Unsubscribe -> User clicks unsubscribe link with JWT token to stop receiving emails
 
 CRON EXECUTION (GitHub Actions):
 - GitHub Actions calls GET /api/cron/job-alert with x-cron-secret header every 6 hours
 - Endpoint authenticates using CRON_SECRET environment variable
-- Processes YouTube videos, extracts jobs, and sends emails to subscribers
-- Stateless HTTP endpoint: safe to call multiple times
-- State tracked in Firestore (lastProcessedAt prevents duplicate processing)
+- Returns 202 with a run ID right away; the run itself (YouTube, Gemini, Firestore,
+  SendGrid) executes on a background thread so the web routes stay responsive
+- GET /api/cron/runs/{run_id} reports stage, counters and the final summary;
+  runs are also stored in the Firestore `cron_runs` collection
+- Only one run is active per process: calling again while it runs returns that run
+- Runs checkpoint to `cron_checkpoints` after extraction and after every send batch;
+  with CRON_TIME_BUDGET_SECONDS set, a run stops at a checkpoint when the budget is
+  used up ("paused" + continuation token) and the next call resumes it
+- Each subscriber only gets the openings matching their preferences; subscribers with
+  no match are skipped and those with the same matches share one rendered email
+- Channels come from the Firestore `channels` collection (seeded from channels.json);
+  each keeps its own lastProcessedAt cursor and polling interval
+
+JOB CATALOG:
+- Every new opening is stored in the Firestore `jobs` collection by the cron run
+- GET /api/jobs serves them from an in-memory inverted index (employment type,
+  work mode, location, skill) with cursor pagination, ETag and Cache-Control
+- The index pulls only jobs whose lastSeenAt moved since its previous sync
 """
\ No newline at end of file
@@ -24,7 +24,7 @@ for v in videos:
     title , description = meta["title"] , meta["description"] 
     transcript = yt.get_transcript(v["videoId"])
     
-    jobs_data = yt.extract_jobs_with_gemini(title,description,transcript)
+    jobs_data = yt.extract_jobs_with_gemini(title,description,transcript,video_id=v["videoId"])
     
     for company in jobs_data["openings"]:
         print("=" * 25)
@@ -64,34 +64,50 @@ async def test_cron_endpoint():
         except Exception as e:
             print(f"❌ Error: {e}")
     
-    # Test 3: With correct secret (should execute)
+    # Test 3: With correct secret (should start a run, then poll it)
     print(f"\n\n{'─'*60}")
-    print("Test 3: Correct x-cron-secret header (should execute)")
+    print("Test 3: Correct x-cron-secret header (should start a run)")
     print(f"{'─'*60}\n")
     
-    async with httpx.AsyncClient(timeout=120.0) as client:
+    async with httpx.AsyncClient(timeout=30.0) as client:
         try:
-            print("Sending request... (this may take a minute)")
+            import json
             response = await client.get(
                 f"{base_url}/api/cron/job-alert",
                 headers={"x-cron-secret": cron_secret}
             )
             print(f"\nStatus: {response.status_code}")
-            print(f"Response:")
-            
-            import json
-            result = response.json()
-            print(json.dumps(result, indent=2))
+            print(f"Response: {response.json()}")
             
-            if response.status_code == 200 and result.get("status") == "success":
-                print("\n✅ Cron endpoint executed successfully!")
-                print(f"   - Videos processed: {result.get('videos_processed', 0)}")
-                print(f"   - Videos with jobs: {result.get('videos_with_jobs', 0)}")
-                print(f"   - Jobs extracted: {result.get('jobs_extracted', 0)}")
-                print(f"   - Emails sent: {result.get('emails_sent', 0)}")
-                print(f"   - Emails failed: {result.get('emails_failed', 0)}")
+            if response.status_code != 202:
+                print("❌ Expected 202, got different status")
             else:
-                print("⚠️  Response received but unexpected status/format")
+                run_id = response.json()["runId"]
+                print(f"\nPolling run {run_id}... (this may take a minute)")
+                
+                while True:
+                    await asyncio.sleep(5)
+                    response = await client.get(
+                        f"{base_url}/api/cron/runs/{run_id}",
+                        headers={"x-cron-secret": cron_secret}
+                    )
+                    run = response.json()
+                    print(f"   status={run.get('status')} stage={run.get('stage')} counters={run.get('counters')}")
+                    if run.get("status") not in ("queued", "running"):
+                        break
+                
+                result = run.get("result") or {}
+                print(json.dumps(run, indent=2))
+                
+                if run.get("status") == "succeeded" and result.get("status") == "success":
+                    print("\n✅ Cron run completed successfully!")
+                    print(f"   - Videos processed: {result.get('videos_processed', 0)}")
+                    print(f"   - Videos with jobs: {result.get('videos_with_jobs', 0)}")
+                    print(f"   - Jobs extracted: {result.get('jobs_extracted', 0)}")
+                    print(f"   - Emails sent: {result.get('emails_sent', 0)}")
+                    print(f"   - Emails failed: {result.get('emails_failed', 0)}")
+                else:
+                    print(f"⚠️  Run finished with status {run.get('status')}: {run.get('error')}")
         except Exception as e:
             print(f"❌ Error: {e}")
     
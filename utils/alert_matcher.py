@@ -0,0 +1,109 @@
+from typing import Callable
+
+from Repository.JobCatalog import job_facets, normalize_filter
+
+# ================== PREFERENCES ==================
+
+# Subscriber preference field -> opening facet it filters on
+PREFERENCE_FACETS = {
+    "workMode": "workMode",
+    "employmentType": "employmentType",
+    "location": "location",
+    "skills": "skill",
+}
+
+
+def parse_preferences(**values) -> dict:
+    """
+    Normalized subscriber preferences from comma-separated strings or lists,
+    e.g. parse_preferences(workMode="Remote", skills="Python, Java").
+
+    Only preferences with at least one known value are kept, so an empty
+    dict means "every opening".
+    """
+    preferences = {}
+    for name, facet in PREFERENCE_FACETS.items():
+        raw = values.get(name)
+        items = raw.split(",") if isinstance(raw, str) else raw or []
+        normalized = sorted({normalize_filter(facet, str(item)) for item in items} - {""})
+        if normalized:
+            preferences[name] = normalized
+    return preferences
+
+# ================== MATCHING ==================
+
+class AlertMatcher:
+    """
+    Matches subscribers to the openings of one run.
+
+    Openings are indexed once by facet value, each value holding the set of
+    opening positions as an int bitmask. A subscriber's subset is the AND of
+    one OR-ed mask per preference, so matching costs a few integer operations
+    per subscriber instead of a scan over every opening. Openings that do not
+    state a facet (no work mode, no skills) are never filtered out by it, and
+    remote openings match any location preference.
+
+    Masks are cached per distinct preferences, and one PreparedJobAlert is
+    rendered per distinct subset, so subscribers who match the same openings
+    share one body.
+    """
+
+    def __init__(self, openings: list, prepare: Callable[[list], object]):
+        self.openings = openings
+        self.everything = (1 << len(openings)) - 1
+        self._prepare = prepare
+        self._index = {facet: {} for facet in PREFERENCE_FACETS.values()}
+        self._unstated = {facet: 0 for facet in PREFERENCE_FACETS.values()}
+
+        for position, opening in enumerate(openings):
+            bit = 1 << position
+            for facet, facet_values in job_facets(opening).items():
+                if not facet_values:
+                    self._unstated[facet] |= bit
+                for value in facet_values:
+                    self._index[facet][value] = self._index[facet].get(value, 0) | bit
+
+        self._remote = self._index["workMode"].get("remote", 0)
+        self._masks = {}
+        self._prepared = {}
+
+    @staticmethod
+    def _key(preferences: dict | None) -> tuple:
+        return tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in (preferences or {}).items()
+        ))
+
+    def match(self, preferences: dict | None) -> int:
+        """Bitmask of the openings a subscriber with `preferences` should get (0 = none)."""
+        key = self._key(preferences)
+        mask = self._masks.get(key)
+        if mask is not None:
+            return mask
+
+        mask = self.everything
+        for name, values in parse_preferences(**(preferences or {})).items():
+            facet = PREFERENCE_FACETS[name]
+            accepted = self._unstated[facet]
+            for value in values:
+                accepted |= self._index[facet].get(value, 0)
+            if facet == "location":
+                accepted |= self._remote
+            mask &= accepted
+
+        self._masks[key] = mask
+        return mask
+
+    def openings_for(self, mask: int) -> list:
+        if mask == self.everything:
+            return self.openings
+        return [opening for position, opening in enumerate(self.openings) if mask >> position & 1]
+
+    def prepared(self, mask: int):
+        """The rendered alert for one subset, built the first time it is needed."""
+        if mask not in self._prepared:
+            self._prepared[mask] = self._prepare(self.openings_for(mask))
+        return self._prepared[mask]
+
+    def stats(self) -> dict:
+        return {"preferenceProfiles": len(self._masks), "alertVariants": len(self._prepared)}
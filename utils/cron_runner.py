@@ -0,0 +1,739 @@
+import os
+import time
+import random
+import secrets
+import threading
+import traceback
+from itertools import islice
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from Repository.ChannelRegistry import ChannelRegistry
+from Repository.sendGrid import SEND_BATCH_SIZE
+from Repository.DeliveryLedger import DeliveryLedger, delivery_status
+from Repository.JobIndex import JobIndex
+from utils.alert_matcher import AlertMatcher
+from utils.pipeline import VideoPipeline, crawl_channels
+from utils.job_classifier import JobVideoClassifier
+
+# ================== CONFIG ==================
+
+CRON_RUNS_COLLECTION = "cron_runs"
+# Finished runs kept in memory for /api/cron/runs/{id}; older ones are read back from Firestore
+CRON_RUNS_KEPT = int(os.getenv("CRON_RUNS_KEPT", "50"))
+
+# Resumable runs: checkpoints, and the pointer to the one still pending
+CHECKPOINTS_COLLECTION = "cron_checkpoints"
+CRON_STATE_COLLECTION = "system_state"
+CRON_STATE_DOC = "cron"
+# Seconds a run may take before it stops at the next checkpoint (0 = no limit)
+CRON_TIME_BUDGET_SECONDS = float(os.getenv("CRON_TIME_BUDGET_SECONDS", "0"))
+# Subscribers per checkpoint in "single" send mode; bulk mode checkpoints after every batch
+CRON_CHECKPOINT_EVERY = int(os.getenv("CRON_CHECKPOINT_EVERY", "100"))
+
+# Passes over failed deliveries after the main send, with jittered exponential backoff
+DELIVERY_RETRY_ROUNDS = int(os.getenv("DELIVERY_RETRY_ROUNDS", "2"))
+DELIVERY_RETRY_BACKOFF_SECONDS = float(os.getenv("DELIVERY_RETRY_BACKOFF_SECONDS", "10"))
+
+# Videos taken from a channel that has never been crawled
+FIRST_RUN_MAX_VIDEOS = 3
+
+# "bulk" packs recipients into multi-personalization requests, "single" sends one email per subscriber
+SEND_MODE = os.getenv("SENDGRID_SEND_MODE", "bulk")
+SUBSCRIBER_PAGE_SIZE = int(os.getenv("SUBSCRIBER_PAGE_SIZE", "500"))
+
+# ================== RUN TRACKING ==================
+
+class CronRun:
+    """
+    Progress of one job alert run.
+
+    The run moves through stages (crawl, extract, save, subscribers, send, retry)
+    while its counters grow. A run that hits its time budget ends as
+    "paused" with a continuation token. Every stage change and the final outcome are
+    written to the `cron_runs` collection, so the status can still be read
+    after a restart or from another worker.
+    """
+
+    def __init__(self, firebase, run_id: str | None = None, continuation: str | None = None):
+        self.firebase = firebase
+        self.continuation = continuation
+        self.run_id = run_id or f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{secrets.token_hex(3)}"
+        self._lock = threading.Lock()
+        self.status = "queued"
+        self.stage = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at = None
+        self.finished_at = None
+        self.counters = {
+            "videos_found": 0,
+            "videos_to_extract": 0,
+            "videos_extracted": 0,
+            "jobs_extracted": 0,
+            "emails_sent": 0,
+            "emails_failed": 0,
+            "emails_skipped": 0
+        }
+        self.result = None
+        self.error = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "runId": self.run_id,
+                "continuation": self.continuation,
+                "status": self.status,
+                "stage": self.stage,
+                "createdAt": self.created_at,
+                "startedAt": self.started_at,
+                "finishedAt": self.finished_at,
+                "counters": dict(self.counters),
+                "result": self.result,
+                "error": self.error
+            }
+
+    def _persist(self):
+        try:
+            self.firebase.set_document(CRON_RUNS_COLLECTION, self.run_id, self.snapshot())
+        except Exception as e:
+            # Status tracking must never break the run itself
+            print(f"⚠️  Could not persist cron run {self.run_id}: {type(e).__name__}: {str(e)}")
+
+    def start(self):
+        with self._lock:
+            self.status = "running"
+            self.started_at = datetime.now(timezone.utc)
+        self._persist()
+
+    def set_stage(self, stage: str):
+        with self._lock:
+            self.stage = stage
+        print(f"   ▶️  [run {self.run_id}] stage: {stage}")
+        self._persist()
+
+    def count(self, **increments):
+        with self._lock:
+            for key, amount in increments.items():
+                self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_counters(self, **values):
+        with self._lock:
+            self.counters.update(values)
+
+    def finish(self, result: dict):
+        with self._lock:
+            self.status = "paused" if result.get("continuation") else "succeeded"
+            self.result = result
+            self.finished_at = datetime.now(timezone.utc)
+        self._persist()
+
+    def fail(self, error: str):
+        with self._lock:
+            self.status = "failed"
+            self.error = error
+            self.finished_at = datetime.now(timezone.utc)
+        self._persist()
+
+
+class CronRunner:
+    """
+    Runs job alerts on a single background thread, off the web event loop.
+
+    start() returns at once with the run that will do the work. Only one run
+    is active per process: triggering while one is queued or running hands
+    back that run instead of starting another. After every run the email
+    outbox, when given, is drained.
+    """
+
+    def __init__(self, firebase, youtube, sendgrid, outbox=None):
+        self.firebase = firebase
+        self.youtube = youtube
+        self.sendgrid = sendgrid
+        self.outbox = outbox
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cron")
+        self._lock = threading.Lock()
+        self._runs = {}
+        self._current = None
+
+    def start(self, continuation: str | None = None) -> tuple:
+        """
+        Queue a new run, resuming the checkpoint `continuation` if given (the
+        pending checkpoint is resumed anyway). Returns (run, started); started
+        is False when a run was already active.
+        """
+        with self._lock:
+            if self._current is not None and self._current.active:
+                return self._current, False
+
+            run = CronRun(self.firebase, continuation=continuation)
+            self._runs[run.run_id] = run
+            self._current = run
+            # Forget the oldest finished runs; Firestore still has them
+            for run_id in list(self._runs)[:-CRON_RUNS_KEPT]:
+                if not self._runs[run_id].active:
+                    del self._runs[run_id]
+
+        self._executor.submit(self._execute, run)
+        return run, True
+
+    def _execute(self, run: CronRun):
+        run.start()
+        try:
+            result = run_job_alert(run, self.firebase, self.youtube, self.sendgrid, continuation=run.continuation)
+            run.finish(result)
+        except Exception as e:
+            print(f"\n❌ [CRON] FATAL ERROR: {str(e)}")
+            print("="*60 + "\n")
+            traceback.print_exc()
+            run.fail(f"{type(e).__name__}: {str(e)}")
+        self._drain_outbox()
+
+    def _drain_outbox(self):
+        """Send queued verification emails; the only sender where no drainer thread survives."""
+        if self.outbox is None:
+            return
+        try:
+            handled = self.outbox.drain()
+            if handled:
+                print(f"📨 [CRON] Outbox: {handled} queued email(s) handled")
+        except Exception:
+            print("⚠️  [CRON] Outbox drain failed")
+            traceback.print_exc()
+
+    def get(self, run_id: str) -> dict | None:
+        """Status of a run, from memory or, for older runs, from Firestore."""
+        run = self._runs.get(run_id)
+        if run is not None:
+            return run.snapshot()
+        return self.firebase.get_document(CRON_RUNS_COLLECTION, run_id)
+
+
+# ================== CHECKPOINTS ==================
+
+class CheckpointStore:
+    """
+    Durable progress of a job alert run, in the `cron_checkpoints` collection.
+
+    A checkpoint is written once the openings are extracted and then after
+    every send batch, holding the openings, the channel cursor updates, the
+    last subscriber handled and the running totals. Its ID is the
+    continuation token. `system_state/cron` points at the unfinished
+    checkpoint, so the next run resumes it even without being given the token.
+    """
+
+    def __init__(self, firebase):
+        self.firebase = firebase
+
+    def load(self, token: str | None = None) -> dict | None:
+        """The checkpoint to resume: `token` if given, otherwise the pending one."""
+        if not token:
+            state = self.firebase.get_document(CRON_STATE_COLLECTION, CRON_STATE_DOC) or {}
+            token = state.get("pendingCheckpoint")
+            if not token:
+                return None
+
+        checkpoint = self.firebase.get_document(CHECKPOINTS_COLLECTION, token)
+        if checkpoint is None or checkpoint.get("status") == "done":
+            return None
+        return checkpoint
+
+    def create(self, token: str, openings: list, channel_updates: dict, summary: dict) -> dict:
+        checkpoint = {
+            "token": token,
+            "status": "pending",
+            "createdAt": datetime.now(timezone.utc),
+            "updatedAt": datetime.now(timezone.utc),
+            "openings": openings,
+            "channelUpdates": channel_updates,
+            "channelsSaved": False,
+            "summary": summary,
+            "cursor": None,
+            "emailsSent": 0,
+            "emailsFailed": 0
+        }
+        self.firebase.set_document(CHECKPOINTS_COLLECTION, token, checkpoint)
+        self.firebase.set_document(CRON_STATE_COLLECTION, CRON_STATE_DOC, {"pendingCheckpoint": token})
+        return checkpoint
+
+    def update(self, checkpoint: dict, **fields):
+        checkpoint.update(fields)
+        checkpoint["updatedAt"] = datetime.now(timezone.utc)
+        self.firebase.update_document(
+            CHECKPOINTS_COLLECTION,
+            checkpoint["token"],
+            {**fields, "updatedAt": checkpoint["updatedAt"]}
+        )
+
+    def complete(self, checkpoint: dict):
+        self.update(checkpoint, status="done")
+        self.firebase.set_document(CRON_STATE_COLLECTION, CRON_STATE_DOC, {"pendingCheckpoint": None})
+
+
+# ================== JOB ALERT RUN ==================
+
+def run_job_alert(run: CronRun, firebase, youtube, sendgrid, continuation: str | None = None,
+                  time_budget: float = CRON_TIME_BUDGET_SECONDS) -> dict:
+    """
+    One job alert: crawl due channels, extract openings, email subscribers
+    and advance the channel cursors. Returns the summary for the run.
+
+    An unfinished checkpoint (the `continuation` token, or the pending one)
+    is resumed at the send stage instead of crawling again. Once
+    `time_budget` seconds have passed, the run stops at the next checkpoint
+    and returns status "paused" with the token to continue from.
+    """
+    started = time.monotonic()
+
+    def out_of_time() -> bool:
+        return time_budget > 0 and time.monotonic() - started >= time_budget
+
+    print("\n" + "="*60)
+    print(f"🔔 [CRON] Starting job alert at {datetime.now(timezone.utc)} (run {run.run_id})")
+    print("="*60)
+
+    checkpoints = CheckpointStore(firebase)
+    checkpoint = checkpoints.load(continuation)
+
+    if checkpoint is not None:
+        print(f"\n⏯️  [CRON] Resuming checkpoint {checkpoint['token']} "
+              f"({checkpoint['emailsSent']} sent so far, cursor {checkpoint['cursor'] or 'start'})")
+        run.set_counters(
+            jobs_extracted=len(checkpoint["openings"]),
+            emails_sent=checkpoint["emailsSent"],
+            emails_failed=checkpoint["emailsFailed"]
+        )
+    else:
+        outcome = _crawl_and_extract(run, firebase, youtube, checkpoints)
+        if "checkpoint" not in outcome:
+            return outcome
+        checkpoint = outcome["checkpoint"]
+
+    # ===== STEP 4: Update state =====
+    if not checkpoint["channelsSaved"]:
+        # The openings are safe in the checkpoint, so cursors can move on before sending
+        print(f"\n💾 [CRON] Updating state...")
+        run.set_stage("save")
+        result = ChannelRegistry(firebase).save(checkpoint["channelUpdates"])
+        for channel_id, error in result["failed"].items():
+            print(f"   ❌ Failed to save state for {channel_id}: {error}")
+        print(f"   ✅ State updated for {len(result['succeeded'])} channel(s)")
+        checkpoints.update(checkpoint, channelsSaved=True)
+
+    if out_of_time():
+        return _paused(checkpoint)
+
+    return _send_alerts(run, firebase, sendgrid, checkpoints, checkpoint, out_of_time)
+
+
+def _paused(checkpoint: dict) -> dict:
+    print(f"\n⏸️  [CRON] Time budget used up, continue with checkpoint {checkpoint['token']}")
+    print("="*60 + "\n")
+    return {
+        **checkpoint["summary"],
+        "status": "paused",
+        "message": "Time budget exhausted, run continues on the next invocation",
+        "continuation": checkpoint["token"],
+        "jobs_extracted": len(checkpoint["openings"]),
+        "emails_sent": checkpoint["emailsSent"],
+        "emails_failed": checkpoint["emailsFailed"]
+    }
+
+
+def _crawl_and_extract(run: CronRun, firebase, youtube, checkpoints: CheckpointStore) -> dict:
+    """
+    Crawl and extract. Returns the final result when there is nothing to send,
+    otherwise {"checkpoint"} holding the openings to deliver.
+    """
+    # ===== STEP 1: Configuration =====
+    registry = ChannelRegistry(firebase)
+    channels = registry.load()
+    due = registry.due_channels(channels)
+
+    print(f"\n📋 [CRON] Configuration:")
+    print(f"   - Registered channels: {len(channels)}")
+    print(f"   - Due channels: {[c.get('name', c['channelId']) for c in due]}")
+    print(f"   - Max Videos (first run): {FIRST_RUN_MAX_VIDEOS}")
+
+    if not due:
+        print("   ⏸️  No channel is due for polling")
+        return {"status": "success", "message": "No channels due", "videos_processed": 0}
+
+    # ===== STEP 2: Crawl due channels =====
+    run.set_stage("crawl")
+    print(f"\n📺 [CRON] Fetching videos...")
+
+    youtube.clear_metadata_cache()
+    # A breaker opened by the previous run must not block this one
+    youtube.gemini.reset()
+
+    # Each channel walks its uploads playlist back to its own cursor, in parallel
+    crawls = crawl_channels(youtube, due, first_run_max_videos=FIRST_RUN_MAX_VIDEOS)
+
+    videos = []
+    for c in crawls:
+        if c["error"] is not None:
+            continue
+        crawl = c["crawl"]
+        print(f"   - {c['channel'].get('name', c['channel']['channelId'])}: "
+              f"{len(crawl['videos'])} new, last processed {c['channel'].get('lastProcessedAt') or 'Never'}, "
+              f"{crawl['pages']} page(s){' (not modified)' if crawl['notModified'] else ''}")
+        videos.extend({**v, "channelId": c["channel"]["channelId"]} for v in crawl["videos"])
+    run.set_counters(videos_found=len(videos))
+
+    # Videos whose extraction failed; their channel's cursor stays before them
+    failed_videos = set()
+
+    def channel_updates():
+        # Only successfully crawled channels advance their cursor and polling interval
+        return {
+            c["channel"]["id"]: registry.poll_update(c["channel"], c["crawl"], failed=failed_videos)
+            for c in crawls
+            if c["error"] is None
+        }
+
+    def save_state():
+        run.set_stage("save")
+        result = registry.save(channel_updates())
+        for channel_id, error in result["failed"].items():
+            print(f"   ❌ Failed to save state for {channel_id}: {error}")
+        return len(result["succeeded"])
+
+    if not videos:
+        print("   ⚠️  No new videos found")
+        save_state()
+        return {"status": "success", "message": "No new videos", "videos_processed": 0}
+
+    print(f"   ✅ Found {len(videos)} video(s)")
+    for v in videos:
+        print(f"      📹 {v['title'][:50]}...")
+
+    # ===== STEP 3: Extract jobs from videos =====
+    run.set_stage("extract")
+    print(f"\n🔍 [CRON] Extracting jobs from videos...")
+
+    found_openings = []
+    videos_with_jobs = 0
+    videos_failed = 0
+    channel_of = {v["videoId"]: v["channelId"] for v in videos}
+
+    # Cheap local gate: obvious non-job videos never reach Gemini
+    classifier = JobVideoClassifier()
+    candidates = classifier.screen(videos)
+    run.set_counters(videos_to_extract=len(candidates))
+    print(f"   - Pre-classifier ({classifier.mode}, threshold {classifier.threshold}): "
+          f"{len(candidates)}/{len(videos)} video(s) sent to Gemini")
+
+    pipeline = VideoPipeline(youtube)
+    print(f"   - Concurrency: {pipeline.concurrency}")
+    extraction = pipeline.run(candidates, on_extracted=lambda n: run.count(videos_extracted=n))
+    pipeline_timings = extraction["timings"]
+
+    for i, entry in enumerate(extraction["results"], 1):
+        classifier.record_outcome(entry["videoId"], entry["result"])
+        print(f"\n   [{i}/{len(candidates)}] Processed: {entry['videoId']} "
+              f"(fetch={entry['timings']['fetch']}, extract={entry['timings']['extract']})")
+        if entry["transcript"] and entry["transcript"]["trimmed_ratio"]:
+            stats = entry["transcript"]
+            print(f"      ✂️  Transcript trimmed {stats['tokens_before']} → {stats['tokens_after']} tokens "
+                  f"({stats['windows_kept']}/{stats['windows_total']} windows)")
+
+        error = entry["error"]
+        if error is not None:
+            print(f"      ❌ Error processing video: {type(error).__name__}: {str(error)}")
+            videos_failed += 1
+            failed_videos.add(entry["videoId"])
+            continue
+
+        result = entry["result"]
+
+        # DEBUG: Print result structure
+        print(f"      Result type: {type(result)}, Result: {result}")
+
+        if result and result.get("status") == "failed":
+            # No usable answer from Gemini: this is not the same as "no jobs"
+            print(f"      ❌ Extraction failed: {result.get('error')}")
+            videos_failed += 1
+            failed_videos.add(entry["videoId"])
+        elif result and isinstance(result, dict):
+            is_job_video = result.get("isJobVideo", False)
+            openings = result.get("openings", [])
+
+            print(f"      isJobVideo: {is_job_video}, Openings count: {len(openings) if openings else 0}")
+
+            if is_job_video and openings and len(openings) > 0:
+                job_count = len(openings)
+                print(f"      ✅ Found {job_count} job opening(s)")
+                found_openings.extend(
+                    {"opening": opening, "videoId": entry["videoId"], "channelId": channel_of.get(entry["videoId"])}
+                    for opening in openings
+                )
+                videos_with_jobs += 1
+            else:
+                print(f"      ℹ️  No jobs in this video (isJobVideo={is_job_video}, openings={len(openings) if openings else 0})")
+        else:
+            print(f"      ⚠️  Invalid result format: {result}")
+            videos_failed += 1
+            failed_videos.add(entry["videoId"])
+
+    pipeline_timings["classifier"] = classifier.summary()
+    pipeline_timings["gemini"] = youtube.gemini.stats()
+    if videos_failed:
+        print(f"\n⚠️  [CRON] Extraction failed for {videos_failed} video(s)"
+              f"{' (circuit breaker open)' if youtube.gemini.breaker_open else ''}, "
+              f"they will be crawled again on the next run")
+    print(f"\n⏱️  [CRON] Pipeline timings: {pipeline_timings}")
+
+    # Drop openings repeated across this run's videos or announced in recent runs
+    job_index = JobIndex(firebase)
+    known_jobs = job_index.load_recent()
+    deduped = job_index.dedupe(found_openings)
+    all_openings = deduped["openings"]
+    run.set_counters(jobs_extracted=len(all_openings))
+    print(f"\n🧬 [CRON] {len(found_openings)} opening(s) found, {len(all_openings)} new "
+          f"({deduped['duplicates']['run']} repeated in this run, {deduped['duplicates']['history']} "
+          f"already announced; {known_jobs} indexed in the last {job_index.window_days} days)")
+
+    summary = {
+        "videos_processed": len(videos),
+        "videos_with_jobs": videos_with_jobs,
+        "videos_failed": videos_failed,
+        "jobs_found": len(found_openings),
+        "duplicates_skipped": deduped["duplicates"],
+        "pipeline_timings": pipeline_timings
+    }
+
+    if not all_openings:
+        print(f"\n📭 [CRON] No new job openings found in any video")
+
+        # Update state anyway
+        job_index.record()
+        save_state()
+
+        message = "No new jobs" if found_openings else "No jobs found"
+        return {"status": "success", "message": message, **summary, "jobs_extracted": 0}
+
+    print(f"\n🎯 [CRON] Total jobs extracted: {len(all_openings)}")
+
+    # Checkpoint: from here on a crash or timeout resumes at the send stage
+    checkpoint = checkpoints.create(run.run_id, all_openings, channel_updates(), summary)
+    # Indexed only once checkpointed, so a crash before this point cannot mark unsent jobs as announced
+    job_index.record()
+    return {"checkpoint": checkpoint}
+
+
+def _send_alerts(run: CronRun, firebase, sendgrid, checkpoints: CheckpointStore,
+                 checkpoint: dict, out_of_time) -> dict:
+    """Email each active subscriber after the checkpoint's cursor the openings matching their preferences."""
+    all_openings = checkpoint["openings"]
+    ledger = DeliveryLedger(firebase, checkpoint["token"])
+
+    # ===== STEP 5: Get active subscribers =====
+    run.set_stage("subscribers")
+    print(f"\n👥 [CRON] Fetching subscribers...")
+
+    # Filtering and projection happen in Firestore; subscribers are streamed page by page
+    # and picked up after the last one handled by an earlier attempt
+    active = firebase.stream_documents(
+        "subscribers",
+        filters={"subscribed": True, "isVerified": True},
+        fields=["email", "unsubscribeToken", "preferences"],
+        page_size=SUBSCRIBER_PAGE_SIZE,
+        start_after=checkpoint["cursor"]
+    )
+
+    # ===== STEP 6: Send job alerts =====
+    run.set_stage("send")
+    print(f"\n📧 [CRON] Sending job alerts...")
+
+    # Job cards are rendered once per matched subset; only the unsubscribe link varies per recipient
+    matcher = AlertMatcher(all_openings, sendgrid.prepare_job_alert)
+    # Throughput is reported per run
+    sendgrid.delivery_stats(reset=True)
+    chunk_size = SEND_BATCH_SIZE if SEND_MODE == "bulk" else CRON_CHECKPOINT_EVERY
+    handled = 0
+    # An interrupted attempt may have delivered the chunk after the cursor without
+    # checkpointing it; the ledger says who already has the email
+    check_ledger = checkpoint["cursor"] is not None or checkpoint["emailsSent"] + checkpoint["emailsFailed"] > 0
+
+    while True:
+        if out_of_time():
+            return _paused(checkpoint)
+
+        chunk = list(islice(active, chunk_size))
+        if not chunk:
+            break
+        handled += len(chunk)
+
+        pending = chunk
+        if check_ledger:
+            done = ledger.lookup([sub["id"] for sub in chunk])
+            pending = [sub for sub in chunk if done.get(sub["id"], {}).get("status") not in ("sent", "undeliverable")]
+            check_ledger = False
+
+        sent, failed = _send_chunk(run, sendgrid, ledger, pending, matcher)
+        ledger.flush()
+
+        # Checkpoint: everyone up to this subscriber has been handled
+        checkpoints.update(
+            checkpoint,
+            cursor=chunk[-1]["id"],
+            emailsSent=checkpoint["emailsSent"] + sent,
+            emailsFailed=checkpoint["emailsFailed"] + failed
+        )
+
+    if handled == 0 and checkpoint["cursor"] is None:
+        checkpoints.complete(checkpoint)
+        print("   📭 No active subscribers")
+        return {
+            "status": "success",
+            "message": "No active subscribers",
+            **checkpoint["summary"],
+            "jobs_extracted": len(all_openings),
+            "emails_sent": 0
+        }
+
+    # ===== STEP 7: Retry failed deliveries =====
+    for round_number in range(1, DELIVERY_RETRY_ROUNDS + 1):
+        entries = ledger.retryable()
+        if not entries:
+            break
+        if out_of_time():
+            return _paused(checkpoint)
+
+        run.set_stage("retry")
+        delay = random.uniform(0.5, 1) * DELIVERY_RETRY_BACKOFF_SECONDS * 2 ** (round_number - 1)
+        print(f"\n🔁 [CRON] Retrying {len(entries)} failed delivery(ies) in {delay:.1f}s (round {round_number})")
+        time.sleep(delay)
+
+        # Re-read the subscribers: someone may have unsubscribed since the first attempt
+        found = firebase.get_many(
+            "subscribers",
+            [e["subscriberId"] for e in entries],
+            fields=["email", "unsubscribeToken", "preferences", "subscribed", "isVerified"]
+        )
+        retry = []
+        dropped = 0
+        for entry in entries:
+            sub = found["documents"].get(entry["subscriberId"])
+            if sub is None or not (sub.get("subscribed") and sub.get("isVerified")):
+                ledger.record(entry["subscriberId"], entry.get("email"), "skipped",
+                              error="No longer subscribed", attempted=False)
+                dropped += 1
+                continue
+            retry.append(sub)
+        run.count(emails_failed=-dropped, emails_skipped=dropped)
+
+        sent, failed = _send_chunk(run, sendgrid, ledger, retry, matcher, retrying=True)
+        ledger.flush()
+        # Recovered and no longer subscribed recipients leave the failed total
+        checkpoints.update(
+            checkpoint,
+            emailsSent=checkpoint["emailsSent"] + sent,
+            emailsFailed=checkpoint["emailsFailed"] - sent - dropped
+        )
+
+    checkpoints.complete(checkpoint)
+
+    emails_sent = checkpoint["emailsSent"]
+    emails_failed = checkpoint["emailsFailed"]
+    summary = checkpoint["summary"]
+
+    # ===== COMPLETION =====
+    print(f"\n🎉 [CRON] Job completed successfully!")
+    print(f"   - Videos processed: {summary['videos_processed']}")
+    print(f"   - Videos with jobs: {summary['videos_with_jobs']}")
+    print(f"   - Videos failed: {summary['videos_failed']}")
+    print(f"   - Total jobs: {len(all_openings)}")
+    print(f"   - Emails sent: {emails_sent}")
+    print(f"   - Emails failed: {emails_failed}")
+    print(f"   - Deliveries: {ledger.summary()}")
+    print(f"   - Alert variants: {matcher.stats()['alertVariants']}")
+    throughput = sendgrid.delivery_stats()
+    if throughput:
+        print(f"   - Throughput: {throughput['meanPerSecond'] if throughput['seconds'] else 0} req/s mean, "
+              f"{throughput.get('maxPerSecond', 0)} max, {throughput['throttled']} throttled")
+    print("="*60 + "\n")
+
+    return {
+        "status": "success",
+        "message": "Job alert completed",
+        **summary,
+        "jobs_extracted": len(all_openings),
+        "emails_sent": emails_sent,
+        "emails_failed": emails_failed,
+        "deliveries": ledger.summary(),
+        "matching": matcher.stats(),
+        "throughput": throughput
+    }
+
+
+def _send_chunk(run: CronRun, sendgrid, ledger: DeliveryLedger, chunk: list, matcher: AlertMatcher,
+                retrying: bool = False) -> tuple:
+    """
+    Send the alert to one chunk of subscribers and record every outcome in
+    the ledger. Returns (sent, failed). Subscribers are grouped by matched
+    subset, so each group goes out with one shared body; those matching no
+    opening are recorded as skipped. On a retry, recipients that fail
+    again are already counted as failed, so only successes change the totals.
+    """
+    emails_sent = 0
+    emails_failed = 0
+    emails_skipped = 0
+
+    groups = {}
+    for sub in chunk:
+        if not sub.get("email") or not sub.get("unsubscribeToken"):
+            print(f"   ⚠️  Skipped {sub.get('id')} - missing data")
+            ledger.record(sub["id"], sub.get("email"), "undeliverable", error="Missing email or unsubscribe token",
+                          attempted=False)
+            emails_failed += 1
+            continue
+        mask = matcher.match(sub.get("preferences"))
+        if not mask:
+            ledger.record(sub["id"], sub["email"], "skipped", error="No opening matches preferences",
+                          attempted=False)
+            emails_skipped += 1
+            continue
+        groups.setdefault(mask, []).append(sub)
+
+    for mask, recipients in groups.items():
+        by_email = {sub["email"]: sub for sub in recipients}
+        payload = [{"email": sub["email"], "unsubscribeToken": sub["unsubscribeToken"]} for sub in recipients]
+        if SEND_MODE == "bulk":
+            delivery = sendgrid.send_job_alert_bulk(
+                payload,
+                matcher.openings_for(mask),
+                batch_size=len(recipients),
+                prepared=matcher.prepared(mask)
+            )
+            batches = delivery["batches"]
+        else:
+            # One email per subscriber; the async backend sends the group concurrently
+            succeeded, failed = sendgrid.send_job_alert_emails(
+                payload,
+                matcher.openings_for(mask),
+                prepared=matcher.prepared(mask)
+            )
+            batches = [{"succeeded": succeeded, "failed": failed}]
+
+        for batch in batches:
+            print(f"   [batch] ✅ {len(batch['succeeded'])} sent, ❌ {len(batch['failed'])} failed")
+            for email in batch["succeeded"]:
+                ledger.record(by_email[email]["id"], email, "sent", code=202)
+            for failure in batch["failed"]:
+                print(f"      ❌ {failure['email']}: {failure['error']}")
+                ledger.record(by_email[failure["email"]]["id"], failure["email"],
+                              delivery_status(failure["code"], failure.get("recipientError", False)),
+                              code=failure["code"], error=failure["error"])
+            emails_sent += len(batch["succeeded"])
+            emails_failed += len(batch["failed"])
+
+    if retrying:
+        run.count(emails_sent=emails_sent, emails_failed=-emails_sent, emails_skipped=emails_skipped)
+        return emails_sent, 0
+    run.count(emails_sent=emails_sent, emails_failed=emails_failed, emails_skipped=emails_skipped)
+    return emails_sent, emails_failed
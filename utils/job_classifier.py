@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import html
+import random
+import threading
+from pathlib import Path
+from datetime import datetime, timezone
+
+# ================== CONFIG ==================
+
+CLASSIFIER_MODE = os.getenv("CLASSIFIER_MODE", "enforce")  # enforce | shadow | off
+CLASSIFIER_THRESHOLD = float(os.getenv("CLASSIFIER_THRESHOLD", "3"))
+# Fraction of rejected videos still sent to Gemini to measure false negatives
+CLASSIFIER_SHADOW_RATE = float(os.getenv("CLASSIFIER_SHADOW_RATE", "0.1"))
+CLASSIFIER_LOG_PATH = Path(os.getenv(
+    "CLASSIFIER_LOG_PATH",
+    str(Path(__file__).parent.parent / ".cache" / "classifier_decisions.jsonl")
+))
+
+# ================== SIGNALS ==================
+
+# (name, pattern, weight). Title signals are the strongest evidence: the channels
+# we crawl put "<Company> Hiring ..." in the title of every job post.
+TITLE_SIGNALS = [
+    ("hiring", r"\bhiring\b|\bhires?\b|\brecruit(ment|ing)?\b", 3),
+    ("intern", r"\bintern(s|ship|ships)?\b", 3),
+    ("freshers", r"\bfreshers?\b|\bgraduates?\b|\bnew grad\b", 2),
+    ("job", r"\bjobs?\b|\bopenings?\b|\bvacanc(y|ies)\b|\boff[ -]?campus\b|\bwalk[ -]?in\b|\bdrive\b", 2),
+    ("apply", r"\bapply\b", 1),
+    ("batch_year", r"\b20[2-3]\d\b", 1),
+    ("role", r"\bsde\b|\bsoftware engineer\b|\bdeveloper\b|\banalyst\b|\btrainee\b", 1),
+]
+
+# Only checked against the title: the description of almost every video
+# (job posts included) ends with the same mentoring/resume-review promo.
+TITLE_NEGATIVE_SIGNALS = [
+    ("non_job_format", r"#shorts\b|\bvlog\b|\bpodcast\b|\bq ?& ?a\b|\blive\b|\bstream\b", -3),
+    ("advice", r"\bhow to\b|\btips\b|\broadmap\b|\bguide\b|\bmistakes\b|\bstrategy\b", -3),
+    ("personal", r"\bmy (journey|story|experience)\b|\bresume review\b|\bmock interview\b", -3),
+    ("course", r"\bcourse\b|\btutorial\b|\blecture\b|\bdsa\b", -2),
+]
+
+DESCRIPTION_SIGNALS = [
+    ("apply_link", r"careers?\.|jobs\.|lever\.co|greenhouse\.io|myworkdayjobs|workday|smartrecruiters|"
+                   r"ashbyhq|naukri\.com|linkedin\.com/jobs|unstop\.com|internshala|forms\.gle|docs\.google\.com/forms", 2),
+    ("eligibility", r"\beligib(le|ility)\b|\bbatch\b|\bqualification\b", 1),
+    ("compensation", r"\bstipend\b|\bctc\b|\blpa\b|\bsalary\b|\bpackage\b", 1),
+    ("apply_text", r"\bapply\b|\bregistration\b|\bregister\b|\blast date\b|\bdeadline\b", 0.5),
+]
+
+COMPANY_NAMES = [
+    "google", "microsoft", "amazon", "meta", "apple", "adobe", "oracle", "ibm", "intel",
+    "salesforce", "uber", "flipkart", "walmart", "paypal", "cisco", "deloitte", "accenture",
+    "infosys", "tcs", "wipro", "capgemini", "cognizant", "hcl", "zoho", "atlassian",
+    "browserstack", "swiggy", "zomato", "phonepe", "razorpay", "goldman sachs", "jp morgan",
+]
+
+_COMPILED_TITLE = [(n, re.compile(p, re.IGNORECASE), w) for n, p, w in TITLE_SIGNALS + TITLE_NEGATIVE_SIGNALS]
+_COMPILED_DESCRIPTION = [(n, re.compile(p, re.IGNORECASE), w) for n, p, w in DESCRIPTION_SIGNALS]
+_COMPANY_PATTERN = re.compile(r"\b(" + "|".join(re.escape(c) for c in COMPANY_NAMES) + r")\b", re.IGNORECASE)
+
+# ================== CLASSIFIER ==================
+
+def score_video(title: str, description: str) -> tuple:
+    """Return (score, matched signal names) for a video's title and description."""
+    title = html.unescape(title or "")
+    description = html.unescape(description or "")
+    score = 0.0
+    signals = []
+
+    for name, pattern, weight in _COMPILED_TITLE:
+        if pattern.search(title):
+            score += weight
+            signals.append(name)
+
+    for name, pattern, weight in _COMPILED_DESCRIPTION:
+        if pattern.search(description):
+            score += weight
+            signals.append(name)
+
+    if _COMPANY_PATTERN.search(title) or _COMPANY_PATTERN.search(description):
+        score += 1
+        signals.append("company")
+
+    return score, signals
+
+
+class JobVideoClassifier:
+    """
+    Cheap keyword/regex gate that runs before Gemini.
+
+    Videos scoring at least `threshold` go on to extraction. Modes:
+    - enforce: videos below the threshold are skipped, except a random
+      `shadow_rate` share which is still extracted to measure false negatives
+    - shadow:  nothing is skipped, decisions are only logged
+    - off:     every video passes and nothing is logged
+
+    Every decision, and later the Gemini outcome of every extracted video, is
+    appended to a JSONL decision log.
+    """
+
+    def __init__(
+        self,
+        threshold: float = CLASSIFIER_THRESHOLD,
+        mode: str = CLASSIFIER_MODE,
+        shadow_rate: float = CLASSIFIER_SHADOW_RATE,
+        log_path: Path | None = CLASSIFIER_LOG_PATH
+    ):
+        self.threshold = threshold
+        self.mode = mode
+        self.shadow_rate = shadow_rate
+        self.log_path = Path(log_path) if log_path else None
+        self._lock = threading.Lock()
+        self.decisions = {}
+
+    def _log(self, record: dict):
+        if not self.log_path:
+            return
+        record = {"at": datetime.now(timezone.utc).isoformat(), **record}
+        try:
+            with self._lock:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"⚠️  Could not write classifier log: {str(e)}")
+
+    def screen(self, videos: list) -> list:
+        """Return the videos that should be sent to Gemini."""
+        if self.mode == "off":
+            return list(videos)
+
+        selected = []
+        for video in videos:
+            score, signals = score_video(video.get("title", ""), video.get("description", ""))
+            passed = score >= self.threshold
+            shadowed = not passed and (self.mode == "shadow" or random.random() < self.shadow_rate)
+
+            decision = {
+                "videoId": video["videoId"],
+                "title": video.get("title", ""),
+                "score": score,
+                "signals": signals,
+                "passed": passed,
+                "shadowed": shadowed
+            }
+            self.decisions[video["videoId"]] = decision
+            self._log({"event": "decision", "threshold": self.threshold, "mode": self.mode, **decision})
+
+            if passed or shadowed:
+                selected.append(video)
+
+        return selected
+
+    def record_outcome(self, video_id: str, result: dict | None):
+        """Log what Gemini found for a screened video."""
+        decision = self.decisions.get(video_id)
+        if decision is None:
+            return
+        found_jobs = bool(result and result.get("isJobVideo") and result.get("openings"))
+        decision["foundJobs"] = found_jobs
+        self._log({"event": "outcome", "videoId": video_id, "passed": decision["passed"], "foundJobs": found_jobs})
+
+    def summary(self) -> dict:
+        decisions = list(self.decisions.values())
+        shadowed = [d for d in decisions if d["shadowed"] and "foundJobs" in d]
+        return {
+            "mode": self.mode,
+            "threshold": self.threshold,
+            "screened": len(decisions),
+            "passed": sum(d["passed"] for d in decisions),
+            "skipped": sum(not d["passed"] and not d["shadowed"] for d in decisions),
+            "shadowed": len(shadowed),
+            "shadow_false_negatives": sum(d["foundJobs"] for d in shadowed)
+        }
+
+
+# ================== EVALUATION ==================
+
+if __name__ == "__main__":
+    # Score a search().list dump (default: sample.json) and report how many
+    # videos the gate would skip. Every video in sample.json is a real job post,
+    # so each skip there is a false negative.
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else str(Path(__file__).parent.parent / "sample.json")
+    threshold = float(sys.argv[2]) if len(sys.argv) > 2 else CLASSIFIER_THRESHOLD
+
+    with open(path, "r", encoding="utf-8") as f:
+        items = json.load(f).get("items", [])
+
+    skipped = 0
+    for item in items:
+        snippet = item["snippet"]
+        score, signals = score_video(snippet["title"], snippet["description"])
+        passed = score >= threshold
+        skipped += not passed
+        print(f"{'PASS' if passed else 'SKIP'}  {score:5.1f}  {html.unescape(snippet['title'])[:60]:<60}  {','.join(signals)}")
+
+    print(f"\nThreshold {threshold}: {len(items) - skipped}/{len(items)} passed, "
+          f"false-negative rate {skipped / len(items) if items else 0:.0%}")
@@ -0,0 +1,203 @@
+import os
+import time
+import traceback
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from Repository.Youtube import GEMINI_BATCH_MAX_VIDEOS
+
+# ================== CONFIG ==================
+
+PIPELINE_CONCURRENCY = int(os.getenv("PIPELINE_CONCURRENCY", "4"))
+
+# ================== VIDEO PIPELINE ==================
+
+class VideoPipeline:
+    """
+    Two-stage extraction pipeline for the cron run.
+
+    Stage 1 (fetch) pulls the transcript and metadata of a video, stage 2
+    (extract) sends them to Gemini. Each stage has its own worker pool, and a
+    video enters stage 2 as soon as its fetch finishes, so fetching later
+    videos overlaps with Gemini calls for earlier ones. Before stage 1, the
+    metadata of the whole batch is resolved with batched videos().list calls.
+
+    With `batch_size` > 1 (GEMINI_BATCH_MAX_VIDEOS by default), fetched
+    videos are grouped before stage 2 and each group goes through
+    Youtube.extract_jobs_batch, which packs them into as few Gemini prompts
+    as the token budget allows.
+
+    A failure in either stage is recorded on the affected videos only; the
+    rest of the batch keeps going.
+    """
+
+    def __init__(self, youtube, concurrency: int | None = None, batch_size: int | None = None):
+        self.youtube = youtube
+        self.concurrency = max(1, concurrency or PIPELINE_CONCURRENCY)
+        self.batch_size = max(1, batch_size or GEMINI_BATCH_MAX_VIDEOS)
+
+    def _fetch(self, video_id: str) -> tuple:
+        started = time.perf_counter()
+        inputs = self.youtube.fetch_video_inputs(video_id)
+        return inputs, round(time.perf_counter() - started, 3)
+
+    def _extract(self, batch: list) -> tuple:
+        started = time.perf_counter()
+        results = self.youtube.extract_jobs_batch([
+            {"videoId": entry["videoId"], **inputs}
+            for entry, inputs in batch
+        ])
+        return results, round(time.perf_counter() - started, 3)
+
+    def run(self, videos: list, on_extracted: Callable[[int], None] | None = None) -> dict:
+        """
+        Process `videos` (dicts with a "videoId") and return:
+
+        {
+          "results": [{"videoId", "result", "error", "transcript", "timings"}, ...],  # input order
+          "timings": {"wall", "metadata", "fetch", "extract", "transcript_tokens"}
+        }
+
+        A batched extraction call's duration is split evenly across its
+        videos; "extract" also reports the number of calls and the longest one.
+
+        `on_extracted`, if given, is called with the size of every extraction
+        batch once it has finished, successfully or not.
+        """
+        started = time.perf_counter()
+
+        # Stage 0: resolve metadata for the whole batch in as few videos().list
+        # calls as possible; the fetch stage then reads it from memory.
+        metadata_started = time.perf_counter()
+        try:
+            self.youtube.get_videos_metadata([video["videoId"] for video in videos])
+        except Exception as e:
+            print(f"   ⚠️  Batched metadata lookup failed, falling back to per-video: {type(e).__name__}: {str(e)}")
+        metadata_elapsed = round(time.perf_counter() - metadata_started, 3)
+
+        entries = [
+            {
+                "videoId": video["videoId"],
+                "result": None,
+                "error": None,
+                "transcript": None,
+                "timings": {"fetch": None, "extract": None}
+            }
+            for video in videos
+        ]
+
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix="fetch") as fetch_pool, \
+                ThreadPoolExecutor(self.concurrency, thread_name_prefix="extract") as extract_pool:
+
+            fetch_futures = {
+                fetch_pool.submit(self._fetch, entry["videoId"]): entry
+                for entry in entries
+            }
+            extract_futures = {}
+            extract_batches = []
+            ready = []
+
+            for future in as_completed(fetch_futures):
+                entry = fetch_futures[future]
+                try:
+                    inputs, elapsed = future.result()
+                    entry["timings"]["fetch"] = elapsed
+                    entry["transcript"] = inputs.get("transcriptStats")
+                except Exception as e:
+                    entry["error"] = e
+                    print(f"   ❌ Fetch failed for {entry['videoId']}: {type(e).__name__}: {str(e)}")
+                    traceback.print_exc()
+                    continue
+
+                ready.append((entry, inputs))
+                if len(ready) >= self.batch_size:
+                    extract_futures[extract_pool.submit(self._extract, ready)] = ready
+                    ready = []
+
+            if ready:
+                extract_futures[extract_pool.submit(self._extract, ready)] = ready
+
+            for future in as_completed(extract_futures):
+                batch = extract_futures[future]
+                try:
+                    results, elapsed = future.result()
+                except Exception as e:
+                    print(f"   ❌ Extraction failed for {[entry['videoId'] for entry, _ in batch]}: "
+                          f"{type(e).__name__}: {str(e)}")
+                    traceback.print_exc()
+                    for entry, _ in batch:
+                        entry["error"] = e
+                else:
+                    # A batched call's duration is split across its videos, so the
+                    # stage total stays the time actually spent in extraction calls
+                    for entry, _ in batch:
+                        entry["result"] = results.get(entry["videoId"])
+                        entry["timings"]["extract"] = round(elapsed / len(batch), 3)
+                    extract_batches.append(elapsed)
+
+                if on_extracted:
+                    on_extracted(len(batch))
+
+        return {
+            "results": entries,
+            "timings": {
+                "wall": round(time.perf_counter() - started, 3),
+                "metadata": metadata_elapsed,
+                "fetch": _stage_stats(entries, "fetch"),
+                "extract": {**_stage_stats(entries, "extract"), "calls": len(extract_batches),
+                            "max_call": round(max(extract_batches, default=0.0), 3)},
+                "transcript_tokens": {
+                    "before": sum(e["transcript"]["tokens_before"] for e in entries if e["transcript"]),
+                    "after": sum(e["transcript"]["tokens_after"] for e in entries if e["transcript"])
+                }
+            }
+        }
+
+
+def _stage_stats(entries: list, stage: str) -> dict:
+    durations = [e["timings"][stage] for e in entries if e["timings"][stage] is not None]
+    if not durations:
+        return {"count": 0, "total": 0.0, "max": 0.0}
+    return {
+        "count": len(durations),
+        "total": round(sum(durations), 3),
+        "max": round(max(durations), 3)
+    }
+
+
+# ================== CHANNEL CRAWL ==================
+
+CHANNEL_CONCURRENCY = int(os.getenv("CHANNEL_CONCURRENCY", "4"))
+
+
+def crawl_channels(youtube, channels: list, first_run_max_videos: int,
+                   concurrency: int = CHANNEL_CONCURRENCY) -> list:
+    """
+    Crawl the uploads of several registry channels in parallel.
+
+    Channels without a cursor are limited to `first_run_max_videos`. Returns
+    one {"channel", "crawl", "error"} dict per channel, in input order; a
+    failing channel only sets its own "error".
+    """
+    def crawl(channel):
+        cursor = channel.get("lastProcessedAt")
+        kwargs = {} if cursor else {"max_videos": first_run_max_videos}
+        return youtube.crawl_uploads(
+            channel["channelId"],
+            published_after=cursor,
+            etag=channel.get("etag"),
+            uploads_playlist_id=channel.get("uploadsPlaylistId"),
+            **kwargs
+        )
+
+    results = []
+    with ThreadPoolExecutor(max(1, concurrency), thread_name_prefix="crawl") as pool:
+        futures = [(channel, pool.submit(crawl, channel)) for channel in channels]
+        for channel, future in futures:
+            try:
+                results.append({"channel": channel, "crawl": future.result(), "error": None})
+            except Exception as e:
+                print(f"   ❌ Crawl failed for {channel['channelId']}: {type(e).__name__}: {str(e)}")
+                results.append({"channel": channel, "crawl": None, "error": e})
+
+    return results
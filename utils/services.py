@@ -0,0 +1,104 @@
+import os
+import time
+import threading
+import traceback
+from typing import Callable
+
+# ================== CONFIG ==================
+
+# Services built in the background at startup ("all", or comma-separated names; empty = none)
+WARMUP_SERVICES = os.getenv("WARMUP_SERVICES", "")
+
+# ================== LAZY SERVICES ==================
+
+class LazyService:
+    """
+    Process-wide service built on first use.
+
+    The factory (which also does the service's heavy SDK imports) runs at
+    most once, under a lock, the first time an attribute is read, so
+    importing the app costs nothing and a route only pays for the clients
+    it actually touches. Attribute access is forwarded to the built object,
+    so a LazyService can stand in wherever the service itself is used.
+    A failed build is not cached; the next access tries again. The proxy's
+    own names (resolve, initialized, report, service_name, init_*) are not
+    forwarded.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], object]):
+        self.service_name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        self.init_seconds = None
+        self.init_error = None
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def resolve(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    try:
+                        instance = self._factory()
+                    except Exception as e:
+                        self.init_error = f"{type(e).__name__}: {str(e)}"
+                        raise
+                    self.init_seconds = round(time.perf_counter() - started, 3)
+                    self.init_error = None
+                    self._instance = instance
+                    print(f"⚙️  {self.service_name} initialized in {self.init_seconds}s")
+        return self._instance
+
+    def __getattr__(self, item):
+        # Only called for attributes LazyService itself does not have
+        return getattr(self.resolve(), item)
+
+    def report(self) -> dict:
+        return {"initialized": self.initialized, "initSeconds": self.init_seconds, "error": self.init_error}
+
+
+class ServiceRegistry:
+    """Named LazyServices, with a warm-up hook and a readiness report."""
+
+    def __init__(self):
+        self.services = {}
+        self.warmup_requested = []
+        self.warmup_finished = False
+
+    def register(self, name: str, factory: Callable[[], object]) -> LazyService:
+        self.services[name] = LazyService(name, factory)
+        return self.services[name]
+
+    def warm_up(self, names: str | list = WARMUP_SERVICES, background: bool = True):
+        """Build the named services ("all" for every one), by default on a daemon thread."""
+        if isinstance(names, str):
+            names = list(self.services) if names.strip() == "all" else [n.strip() for n in names.split(",") if n.strip()]
+        self.warmup_requested = [n for n in names if n in self.services]
+
+        def build():
+            for name in self.warmup_requested:
+                try:
+                    self.services[name].resolve()
+                except Exception:
+                    print(f"⚠️  Warm-up of {name} failed")
+                    traceback.print_exc()
+            self.warmup_finished = True
+
+        if not background:
+            build()
+        elif self.warmup_requested:
+            threading.Thread(target=build, name="service-warmup", daemon=True).start()
+        else:
+            self.warmup_finished = True
+
+    def readiness(self) -> dict:
+        """Ready once every service asked for in the warm-up is initialized."""
+        return {
+            "ready": all(self.services[name].initialized for name in self.warmup_requested),
+            "warmup": {"requested": self.warmup_requested, "finished": self.warmup_finished},
+            "services": {name: service.report() for name, service in self.services.items()}
+        }
@@ -0,0 +1,111 @@
+import os
+import re
+
+from utils.job_classifier import COMPANY_NAMES
+
+# ================== CONFIG ==================
+
+TRANSCRIPT_TOKEN_BUDGET = int(os.getenv("TRANSCRIPT_TOKEN_BUDGET", "3000"))
+TRANSCRIPT_WINDOW_SECONDS = float(os.getenv("TRANSCRIPT_WINDOW_SECONDS", "45"))
+
+# ================== SIGNALS ==================
+
+MONTHS = r"jan(uary)?|feb(ruary)?|mar(ch)?|apr(il)?|may|june?|july?|aug(ust)?|sep(t|tember)?|oct(ober)?|nov(ember)?|dec(ember)?"
+
+WINDOW_SIGNALS = [
+    (re.compile(r"\bapply\b|\bapplication\b|\bregist(er|ration)\b", re.IGNORECASE), 2),
+    (re.compile(r"\beligib(le|ility)\b|\bbatch\b|\bgraduat(e|es|ing)\b|\bdegree\b|\bcgpa\b", re.IGNORECASE), 2),
+    (re.compile(r"\bstipend\b|\bctc\b|\blpa\b|\bsalary\b|\bpackage\b|\bper month\b", re.IGNORECASE), 2),
+    (re.compile(r"\bhiring\b|\bintern(s|ship)?\b|\bfreshers?\b|\brole\b|\bposition\b|\bopenings?\b", re.IGNORECASE), 1.5),
+    (re.compile(r"\blocation\b|\bremote\b|\bhybrid\b|\bon[- ]?site\b|\bwork from home\b|\bwfh\b", re.IGNORECASE), 1),
+    (re.compile(r"\bskills?\b|\bexperience\b|\brequire(d|ments)?\b|\bduration\b", re.IGNORECASE), 1),
+    (re.compile(r"https?://|\bwww\.|\bdot com\b|\blink (is )?in (the )?description\b", re.IGNORECASE), 2),
+    (re.compile(r"\blast date\b|\bdeadline\b|\b\d{1,2}(st|nd|rd|th)?\s+(" + MONTHS + r")\b|\b(" + MONTHS + r")\s+\d{1,2}\b",
+                re.IGNORECASE), 1.5),
+    (re.compile(r"\b(" + "|".join(re.escape(c) for c in COMPANY_NAMES) + r")\b", re.IGNORECASE), 2),
+]
+
+# ================== WINDOWING ==================
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English)."""
+    return (len(text) + 3) // 4
+
+
+def split_windows(segments: list, window_seconds: float = TRANSCRIPT_WINDOW_SECONDS) -> list:
+    """Group timed transcript segments into consecutive windows of about `window_seconds`."""
+    windows = []
+    current = None
+    for segment in segments:
+        if current is None or segment["start"] - current["start"] >= window_seconds:
+            current = {"start": segment["start"], "texts": []}
+            windows.append(current)
+        current["texts"].append(segment["text"])
+
+    return [
+        {"index": i, "start": w["start"], "text": " ".join(w["texts"])}
+        for i, w in enumerate(windows)
+    ]
+
+
+def score_window(text: str) -> float:
+    return sum(weight for pattern, weight in WINDOW_SIGNALS if pattern.search(text))
+
+
+def _timestamp(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def select_transcript(segments: list, token_budget: int = TRANSCRIPT_TOKEN_BUDGET,
+                      window_seconds: float = TRANSCRIPT_WINDOW_SECONDS) -> dict:
+    """
+    Trim a transcript to its most job-relevant windows within `token_budget`.
+
+    A transcript that already fits is returned whole. Otherwise windows are
+    taken by descending relevance score until the budget is spent, then put
+    back in chronological order with [mm:ss] markers. Returns
+    {"text", "stats"} where stats records how much was trimmed.
+    """
+    full_text = " ".join(s["text"] for s in segments)
+    tokens_before = estimate_tokens(full_text)
+
+    if tokens_before <= token_budget:
+        windows_total = len(split_windows(segments, window_seconds)) if segments else 0
+        return {
+            "text": full_text,
+            "stats": {
+                "windows_total": windows_total,
+                "windows_kept": windows_total,
+                "tokens_before": tokens_before,
+                "tokens_after": tokens_before,
+                "trimmed_ratio": 0.0
+            }
+        }
+
+    windows = split_windows(segments, window_seconds)
+    ranked = sorted(windows, key=lambda w: (-score_window(w["text"]), w["index"]))
+
+    kept = []
+    used = 0
+    for window in ranked:
+        cost = estimate_tokens(window["text"]) + 3
+        if used + cost > token_budget:
+            continue
+        kept.append(window)
+        used += cost
+
+    kept.sort(key=lambda w: w["index"])
+    text = "\n".join(f"[{_timestamp(w['start'])}] {w['text']}" for w in kept)
+    tokens_after = estimate_tokens(text)
+
+    return {
+        "text": text,
+        "stats": {
+            "windows_total": len(windows),
+            "windows_kept": len(kept),
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "trimmed_ratio": round(1 - tokens_after / tokens_before, 3)
+        }
+    }